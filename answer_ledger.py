@@ -0,0 +1,144 @@
+"""Module for remembering submitted answers and rejecting known-bad ones locally."""
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are still merged, but not under a cross-process lock
+    fcntl = None
+
+VERDICT_CORRECT = 'correct'
+VERDICT_TOO_HIGH = 'too high'
+VERDICT_TOO_LOW = 'too low'
+VERDICT_WRONG = 'wrong'
+
+
+def verdict_from_message(message):
+    """Classifies an AoC answer response, or returns None if it says nothing about the answer."""
+    if "That's the right answer" in message:
+        return VERDICT_CORRECT
+    if "That's not the right answer" not in message:
+        return None  # Rate limit, wrong level, ...
+    if "too high" in message:
+        return VERDICT_TOO_HIGH
+    if "too low" in message:
+        return VERDICT_TOO_LOW
+    return VERDICT_WRONG
+
+
+def _as_int(answer):
+    try:
+        return int(answer)
+    except ValueError:
+        return None
+
+
+class AnswerLedger:
+    """Persistent record of submitted answers per (year, day, part).
+
+    Besides every answer and its verdict, the ledger keeps the tightest bounds
+    learned from "too high"/"too low" responses, so answers that are already
+    known to be wrong can be rejected without a round-trip.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        self._loaded = None  # (mtime_ns, size) of the file _data was read from
+        self._reload()
+
+    def _reload(self):
+        """Rereads the ledger file if another process (or instance) has written it since."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) == self._loaded:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._data = json.load(f)
+            self._loaded = (stat.st_mtime_ns, stat.st_size)
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, year, day, part):
+        return f"{year}/{day}/{part}"
+
+    def entry(self, year, day, part):
+        """Returns {'answers': {answer: verdict}, 'low', 'high', 'correct'} for a puzzle part."""
+        with self._lock:
+            self._reload()
+            entry = self._data.get(self._key(year, day, part), {})
+        return {
+            'answers': dict(entry.get('answers', {})),
+            'low': entry.get('low'),
+            'high': entry.get('high'),
+            'correct': entry.get('correct'),
+        }
+
+    def check(self, year, day, part, answer):
+        """Returns why `answer` is known to be wrong, or None if it is worth submitting."""
+        entry = self.entry(year, day, part)
+        if entry['correct'] is not None:
+            return f"Already solved with {entry['correct']}"
+        if answer in entry['answers']:
+            return f"Already submitted {answer}: {entry['answers'][answer]}"
+        value = _as_int(answer)
+        if value is not None:
+            if entry['low'] is not None and value <= entry['low']:
+                return f"{answer} is too low (must be above {entry['low']})"
+            if entry['high'] is not None and value >= entry['high']:
+                return f"{answer} is too high (must be below {entry['high']})"
+        return None
+
+    def record(self, year, day, part, answer, verdict):
+        """Stores the verdict for a submitted answer and tightens the bounds.
+
+        The file is reread under an exclusive lock first, so verdicts recorded
+        by other processes sharing it are kept.
+        """
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(f"{self.path}.lock", 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._reload()
+                entry = self._data.setdefault(self._key(year, day, part), {'answers': {}})
+                entry['answers'][answer] = verdict
+                value = _as_int(answer)
+                if verdict == VERDICT_CORRECT:
+                    entry['correct'] = answer
+                elif verdict == VERDICT_TOO_LOW and value is not None:
+                    entry['low'] = value if entry.get('low') is None else max(value, entry['low'])
+                elif verdict == VERDICT_TOO_HIGH and value is not None:
+                    entry['high'] = value if entry.get('high') is None else min(value, entry['high'])
+                self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        stat = os.stat(self.path)
+        self._loaded = (stat.st_mtime_ns, stat.st_size)
+
+    def format(self, year=None, day=None):
+        """Returns a human-readable summary, optionally limited to one year and/or day."""
+        with self._lock:
+            self._reload()
+            keys = sorted(self._data, key=lambda k: tuple(int(p) for p in k.split('/')))
+        lines = []
+        for key in keys:
+            entry_year, entry_day, part = (int(p) for p in key.split('/'))
+            if (year is not None and entry_year != year) or (day is not None and entry_day != day):
+                continue
+            entry = self.entry(entry_year, entry_day, part)
+            bounds = f"{entry['low'] if entry['low'] is not None else '-inf'} < answer < " \
+                     f"{entry['high'] if entry['high'] is not None else 'inf'}"
+            status = f"solved: {entry['correct']}" if entry['correct'] is not None else bounds
+            lines.append(f"{entry_year} day {entry_day} part {part} ({status})")
+            for answer, verdict in entry['answers'].items():
+                lines.append(f"    {answer}: {verdict}")
+        return '\n'.join(lines) or "No answers recorded"
@@ -0,0 +1,276 @@
+"""Helpers for grid and graph puzzles, imported by the generated solution templates.
+
+NumPy is only needed for ArrayGrid and is imported the first time one is built,
+so solutions that don't use it don't pay for the import.
+"""
+import functools
+import heapq
+import sys
+from array import array
+from collections import deque
+
+import input_loaders
+
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+class Point:
+    """2D point (row, col) with vector arithmetic."""
+    __slots__ = ('r', 'c')
+
+    def __init__(self, r, c):
+        self.r = r
+        self.c = c
+
+    def __add__(self, other):
+        return Point(self.r + other.r, self.c + other.c)
+
+    def __sub__(self, other):
+        return Point(self.r - other.r, self.c - other.c)
+
+    def __mul__(self, k):
+        return Point(self.r * k, self.c * k)
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and self.r == other.r and self.c == other.c
+
+    def __hash__(self):
+        return hash((self.r, self.c))
+
+    def __iter__(self):
+        yield self.r
+        yield self.c
+
+    def __repr__(self):
+        return f"Point({self.r}, {self.c})"
+
+    def manhattan(self, other):
+        return abs(self.r - other.r) + abs(self.c - other.c)
+
+    def neighbors4(self):
+        return [Point(self.r + dr, self.c + dc) for dr, dc in DIRECTIONS4]
+
+    def neighbors8(self):
+        return [Point(self.r + dr, self.c + dc) for dr, dc in DIRECTIONS8]
+
+
+DIRECTIONS4 = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # Up, right, down, left
+DIRECTIONS8 = DIRECTIONS4 + [(-1, -1), (-1, 1), (1, 1), (1, -1)]
+
+
+class ArrayGrid:
+    """Character grid backed by a 2D NumPy uint8 array.
+
+    Whole-grid operations (masks, neighbour counts, convolutions) run as
+    vectorized array operations instead of nested Python loops.
+    """
+    __slots__ = ('cells',)
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Builds a grid from raw input bytes without per-row copies."""
+        np = _numpy()
+        grid = input_loaders.parse_grid(data)
+        padded = np.frombuffer(grid.data + b'\n' * (grid.height * grid.stride - len(grid.data)), dtype=np.uint8)
+        return cls(padded.reshape(grid.height, grid.stride)[:, :grid.width].copy())
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    def __getitem__(self, pos):
+        return self.cells[pos]
+
+    def __contains__(self, pos):
+        row, col = pos
+        height, width = self.cells.shape
+        return 0 <= row < height and 0 <= col < width
+
+    def mask(self, chars):
+        """Boolean array that is True where the cell is one of `chars` (bytes)."""
+        return _numpy().isin(self.cells, list(chars))
+
+    def find(self, char):
+        """Returns (row, col) of the first cell equal to `char` (one byte), or None."""
+        hits = _numpy().argwhere(self.cells == char[0])
+        return tuple(int(v) for v in hits[0]) if len(hits) else None
+
+    def find_all(self, char):
+        """Returns an (N, 2) array of the positions of every cell equal to `char`."""
+        return _numpy().argwhere(self.cells == char[0])
+
+    def neighbors4(self, pos):
+        row, col = pos
+        height, width = self.cells.shape
+        for dr, dc in DIRECTIONS4:
+            r, c = row + dr, col + dc
+            if 0 <= r < height and 0 <= c < width:
+                yield r, c
+
+    def convolve(self, values, kernel):
+        """Sums `values` (2D array) under a small kernel centred on every cell, zero-padded."""
+        np = _numpy()
+        kernel = np.asarray(kernel)
+        kh, kw = kernel.shape
+        pad_r, pad_c = kh // 2, kw // 2
+        padded = np.pad(values.astype(np.int64), ((pad_r, pad_r), (pad_c, pad_c)))
+        height, width = values.shape
+        result = np.zeros((height, width), dtype=np.int64)
+        for dr in range(kh):
+            for dc in range(kw):
+                if kernel[dr, dc]:
+                    result += kernel[dr, dc] * padded[dr:dr + height, dc:dc + width]
+        return result
+
+    def neighbor_counts(self, mask, diagonal=True):
+        """Counts, for every cell, how many of its neighbours are True in `mask`."""
+        kernel = [[1, 1, 1], [1, 0, 1], [1, 1, 1]] if diagonal else [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+        return self.convolve(mask, kernel)
+
+    def __str__(self):
+        return '\n'.join(row.tobytes().decode() for row in self.cells)
+
+
+class Graph:
+    """Directed graph in compressed sparse row form over nodes 0..n-1.
+
+    Edges live in flat arrays (offsets, targets, weights), which keeps large
+    graphs compact and makes neighbour iteration a slice.
+    """
+    __slots__ = ('offsets', 'targets', 'weights')
+
+    def __init__(self, offsets, targets, weights):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, node_count, edges):
+        """Builds a graph from (source, target) or (source, target, weight) tuples."""
+        counts = [0] * (node_count + 1)
+        for edge in edges:
+            counts[edge[0] + 1] += 1
+        for i in range(node_count):
+            counts[i + 1] += counts[i]
+        offsets = array('l', counts)
+        fill = list(counts[:-1])
+        targets = array('l', [0] * len(edges))
+        weights = array('d', [1.0] * len(edges))
+        for edge in edges:
+            slot = fill[edge[0]]
+            fill[edge[0]] += 1
+            targets[slot] = edge[1]
+            if len(edge) > 2:
+                weights[slot] = edge[2]
+        return cls(offsets, targets, weights)
+
+    @property
+    def node_count(self):
+        return len(self.offsets) - 1
+
+    def neighbors(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+
+def _array_grid_graph(grid, passable, directions):
+    """Vectorized grid_graph() for an ArrayGrid."""
+    np = _numpy()
+    height, width = grid.shape
+    open_cells = grid.mask(passable)
+    ids = np.arange(height * width).reshape(height, width)
+    sources, targets = [], []
+    for dr, dc in directions:
+        src = (slice(max(0, -dr), height - max(0, dr)), slice(max(0, -dc), width - max(0, dc)))
+        dst = (slice(max(0, dr), height - max(0, -dr)), slice(max(0, dc), width - max(0, -dc)))
+        both = open_cells[src] & open_cells[dst]
+        sources.append(ids[src][both])
+        targets.append(ids[dst][both])
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)[np.argsort(sources, kind='stable')]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=height * width))))
+    graph = Graph(array('l', offsets.tolist()), array('l', targets.tolist()),
+                  array('d', [1.0]) * len(targets))
+    return graph, width
+
+
+def grid_graph(grid, passable, diagonal=False):
+    """Builds a Graph over the cells of a grid (Grid or ArrayGrid) whose byte value is in `passable`.
+
+    Node ids are row * width + col. Returns (graph, width).
+    """
+    directions = DIRECTIONS8 if diagonal else DIRECTIONS4
+    if isinstance(grid, ArrayGrid):
+        return _array_grid_graph(grid, passable, directions)
+
+    height, width = grid.height, grid.width
+    allowed = set(passable)
+    open_cells = [[grid[r, c] in allowed for c in range(width)] for r in range(height)]
+    edges = []
+    for r in range(height):
+        for c in range(width):
+            if not open_cells[r][c]:
+                continue
+            for dr, dc in directions:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < height and 0 <= nc < width and open_cells[nr][nc]:
+                    edges.append((r * width + c, nr * width + nc))
+    return Graph.from_edges(height * width, edges), width
+
+
+def bfs(graph, start):
+    """Returns the unweighted distance from `start` to every node (-1 if unreachable)."""
+    offsets, targets = graph.offsets, graph.targets
+    dist = array('l', [-1]) * graph.node_count
+    dist[start] = 0
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        next_dist = dist[node] + 1
+        for i in range(offsets[node], offsets[node + 1]):
+            target = targets[i]
+            if dist[target] < 0:
+                dist[target] = next_dist
+                queue.append(target)
+    return dist
+
+
+def dijkstra(graph, start):
+    """Returns the weighted distance from `start` to every node (inf if unreachable)."""
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array('d', [float('inf')]) * graph.node_count
+    dist[start] = 0.0
+    heap = [(0.0, start)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        for i in range(offsets[node], offsets[node + 1]):
+            target = targets[i]
+            nd = d + weights[i]
+            if nd < dist[target]:
+                dist[target] = nd
+                heapq.heappush(heap, (nd, target))
+    return dist
+
+
+def memoized(func=None, recursion_limit=100000):
+    """functools.cache for deep recursive solutions; also raises the recursion limit.
+
+    Use as @memoized or @memoized(recursion_limit=...).
+    """
+    def decorate(f):
+        if sys.getrecursionlimit() < recursion_limit:
+            sys.setrecursionlimit(recursion_limit)
+        return functools.cache(f)
+    return decorate(func) if func is not None else decorate
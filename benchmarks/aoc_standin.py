@@ -0,0 +1,263 @@
+"""Local stand-in for the adventofcode.com endpoints used by main.py.
+
+Serves the year page (with the unlock countdown), day pages with one or two
+articles, /input and /answer (right, wrong with too high/too low, and wait
+responses). Days unlock by the stand-in's own clock, which can be shifted to
+just before any unlock; the Date header follows that clock, so main.py's
+server clock estimation and unlock wait run as they would in December.
+
+Pages and inputs are replayed from a content store filled by
+`main.py prefetch` (correct answers from an answer ledger) or generated.
+Every response can be delayed and a fraction turned into 503s.
+
+Usage: python benchmarks/aoc_standin.py [--port 8080] [--year Y] [--unlock-day D --unlock-in SECONDS]
+           [--store DIR] [--ledger FILE] [--latency S] [--jitter S] [--error-rate F] [--cooldown S]
+Then run main.py with AOC_BASE_URL=http://localhost:8080
+"""
+import argparse
+import email.utils
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import content_store
+import unlock_scheduler
+
+DAY_RE = re.compile(r'^/(\d+)/day/(\d+)(/input|/answer)?$')
+ARTICLE_RE = re.compile(r'<article class="day-desc">.*?</article>', re.DOTALL)
+
+
+def generated_day(day, seed=2024):
+    """Returns (part 1 article, part 2 article, input, {part: answer}) for a synthetic puzzle."""
+    rng = random.Random(seed * 100 + day)
+    numbers = [rng.randint(1, 99999) for _ in range(1000)]
+    data = ''.join(f"{a}   {b}\n" for a, b in zip(numbers[::2], numbers[1::2])).encode()
+    answers = {1: str(sum(numbers[::2]) - sum(numbers[1::2])), 2: str(max(numbers) * min(numbers))}
+    part1 = f"""<article class="day-desc"><h2>--- Day {day}: Stand-in ---</h2>
+<p>The elves have two lists of location IDs. For example:</p>
+<pre><code>3   4
+4   3
+2   5
+</code></pre>
+<p>In the example above, this produces a <em>total distance of 3</em>.</p>
+</article>"""
+    part2 = f"""<article class="day-desc"><h2 id="part2">--- Part Two ---</h2>
+<p>Now multiply the largest and the smallest ID. For example:</p>
+<pre><code>3   4
+4   3
+2   5
+</code></pre>
+<p>In the example above, the result is <code><em>10</em></code>.</p>
+</article>"""
+    return part1, part2, data, answers
+
+
+class AocStandIn:
+    """State of the stand-in: clock, puzzle content, solved parts and submission cooldowns."""
+    def __init__(self, year, store=None, ledger=None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, cooldown=60.0):
+        self.year = year
+        self.store = content_store.ContentStore(store) if store else None
+        self.ledger = {}
+        if ledger:
+            with open(ledger, 'r') as f:
+                self.ledger = json.load(f)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.clock_offset = 0.0
+        self._lock = threading.Lock()
+        self._days = {}
+        self.solved = set()  # (day, part)
+        self.wait_until = {}  # day -> server time before which answers are refused
+        self.requests = []  # (method, path, status)
+
+    def now(self):
+        return time.time() + self.clock_offset
+
+    def unlock_in(self, day, seconds):
+        """Shifts the clock so `day` unlocks `seconds` from now; returns the local unlock time."""
+        unlock_at = unlock_scheduler.unlock_time(self.year, day).timestamp()
+        self.clock_offset = unlock_at - seconds - time.time()
+        return unlock_at - self.clock_offset
+
+    def is_unlocked(self, day):
+        return self.now() >= unlock_scheduler.unlock_time(self.year, day).timestamp()
+
+    def day(self, day):
+        """Returns (part 1 article, part 2 article, input, answers), replayed or generated."""
+        with self._lock:
+            if day not in self._days:
+                part1, part2, data, answers = generated_day(day, self.year)
+                if self.store is not None:
+                    page = self.store.get(self.year, day, 'page')
+                    if page is not None:
+                        articles = ARTICLE_RE.findall(page.decode('utf-8'))
+                        part1 = articles[0] if articles else part1
+                        part2 = articles[1] if len(articles) > 1 else part2
+                    data = self.store.get(self.year, day, 'input') or data
+                for part in (1, 2):
+                    correct = self.ledger.get(f"{self.year}/{day}/{part}", {}).get('correct')
+                    if correct is not None:
+                        answers[part] = correct
+                self._days[day] = (part1, part2, data, answers)
+            return self._days[day]
+
+    def page(self, day):
+        part1, part2, _, _ = self.day(day)
+        articles = part1 + (part2 if (day, 1) in self.solved else '')
+        return f"<!DOCTYPE html><html><body><main>{articles}</main></body></html>"
+
+    def calendar(self):
+        next_day = next((day for day in range(1, 26) if not self.is_unlocked(day)), None)
+        countdown = ''
+        if next_day is not None:
+            remaining = int(unlock_scheduler.unlock_time(self.year, next_day).timestamp() - self.now())
+            countdown = f'<div class="countdown">Day {next_day} unlocks in {remaining} seconds</div>'
+        return f"<!DOCTYPE html><html><body><main><h1>Advent of Code {self.year}</h1>{countdown}</main></body></html>"
+
+    def answer(self, day, part, answer):
+        """Returns the response message for a submitted answer."""
+        with self._lock:
+            left = self.wait_until.get(day, 0) - self.now()
+            if left > 0:
+                return ("You gave an answer too recently; you have to wait after submitting an answer "
+                        f"before trying again.  You have {int(left) + 1}s left to wait.")
+            if (day, part) in self.solved or (part == 2 and (day, 1) not in self.solved):
+                return "You don't seem to be solving the right level.  Did you already complete it?"
+        correct = self.day(day)[3][part]
+        with self._lock:
+            if answer == correct:
+                self.solved.add((day, part))
+                return "That's the right answer!  You are one gold star closer to saving Christmas."
+            self.wait_until[day] = self.now() + self.cooldown
+        hint = ''
+        if answer.lstrip('-').isdigit() and correct.lstrip('-').isdigit():
+            hint = ' your answer is too high.' if int(answer) > int(correct) else ' your answer is too low.'
+        return f"That's not the right answer;{hint}  Please wait one minute before trying again."
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the stand-in endpoints from `self.server.standin`."""
+    def date_time_string(self, timestamp=None):
+        return email.utils.formatdate(self.server.standin.now(), usegmt=True)
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8', headers=()):
+        self.server.standin.requests.append((self.command, self.path, status))
+        body = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def simulate_network(self):
+        """Applies the configured latency; returns True if this request should fail with a 503."""
+        standin = self.server.standin
+        delay = standin.latency + random.uniform(0, standin.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < standin.error_rate:
+            self.send_body(503, "Service Unavailable", 'text/plain', [('Retry-After', '1')])
+            return True
+        return False
+
+    def route(self):
+        """Returns (year, day, endpoint) for day URLs, or None."""
+        match = DAY_RE.match(self.path.split('?')[0])
+        if not match:
+            return None
+        return int(match.group(1)), int(match.group(2)), match.group(3) or ''
+
+    def do_GET(self):
+        if self.simulate_network():
+            return
+        standin = self.server.standin
+        if self.path.rstrip('/') == f"/{standin.year}":
+            self.send_body(200, standin.calendar())
+            return
+        route = self.route()
+        if route is None or route[0] != standin.year or route[2] == '/answer' or not 1 <= route[1] <= 25:
+            self.send_body(404, "Not Found", 'text/plain')
+            return
+        _, day, endpoint = route
+        if not standin.is_unlocked(day):
+            self.send_body(404, "Not Found", 'text/plain')
+        elif endpoint == '/input':
+            if 'session=' not in self.headers.get('Cookie', ''):
+                self.send_body(400, "Puzzle inputs differ by user.  Please log in to get your puzzle input.",
+                               'text/plain')
+            else:
+                self.send_body(200, standin.day(day)[2], 'text/plain')
+        else:
+            self.send_body(200, standin.page(day))
+
+    def do_POST(self):
+        if self.simulate_network():
+            return
+        standin = self.server.standin
+        route = self.route()
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        if route is None or route[2] != '/answer' or not standin.is_unlocked(route[1]):
+            self.send_body(404, "Not Found", 'text/plain')
+            return
+        part = int(form.get('level', ['1'])[0])
+        message = standin.answer(route[1], part, form.get('answer', [''])[0].strip())
+        self.send_body(200, f"<!DOCTYPE html><html><body><main><article><p>{message}</p></article></main></body></html>")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(standin, port=0):
+    """Starts the stand-in in a background thread; returns the server (its URL port is server.server_port)."""
+    server = ThreadingHTTPServer(('localhost', port), StandInHandler)
+    server.standin = standin
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--year', type=int, default=time.localtime().tm_year)
+    parser.add_argument('--unlock-day', type=int, help="Shift the clock so this day unlocks soon")
+    parser.add_argument('--unlock-in', type=float, default=30.0, help="Seconds until --unlock-day unlocks")
+    parser.add_argument('--store', help="Content store to replay pages and inputs from")
+    parser.add_argument('--ledger', help="Answer ledger (answers.json) to take correct answers from")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--cooldown', type=float, default=60.0, help="Seconds to wait after a wrong answer")
+    args = parser.parse_args()
+
+    standin = AocStandIn(args.year, args.store, args.ledger, args.latency, args.jitter,
+                         args.error_rate, args.cooldown)
+    if args.unlock_day:
+        standin.unlock_in(args.unlock_day, args.unlock_in)
+        print(f"Day {args.unlock_day} unlocks in {args.unlock_in:.0f}s (stand-in clock)")
+    server = start(standin, args.port)
+    print(f"AoC stand-in for {args.year} at http://localhost:{server.server_port}")
+    print(f"Run main.py with AOC_BASE_URL=http://localhost:{server.server_port} --year {args.year}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
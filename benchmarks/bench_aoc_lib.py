@@ -0,0 +1,97 @@
+"""Benchmark of the aoc_lib grid and graph helpers against naive pure-Python versions.
+
+Usage: python benchmarks/bench_aoc_lib.py [--size N] [--repeat N]
+"""
+import argparse
+import random
+import timeit
+from collections import deque
+
+import corpus  # noqa: F401  (puts the repo on sys.path)
+import aoc_lib
+
+
+def naive_neighbor_counts(lines):
+    height, width = len(lines), len(lines[0])
+    counts = []
+    for r in range(height):
+        row = []
+        for c in range(width):
+            total = 0
+            for dr, dc in aoc_lib.DIRECTIONS8:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < height and 0 <= nc < width and lines[nr][nc] == '#':
+                    total += 1
+            row.append(total)
+        counts.append(row)
+    return counts
+
+
+def naive_bfs(lines, start):
+    """BFS over (row, col) tuples with a dict of distances."""
+    height, width = len(lines), len(lines[0])
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for dr, dc in aoc_lib.DIRECTIONS4:
+            nxt = (r + dr, c + dc)
+            if 0 <= nxt[0] < height and 0 <= nxt[1] < width and lines[nxt[0]][nxt[1]] == '.' and nxt not in dist:
+                dist[nxt] = dist[(r, c)] + 1
+                queue.append(nxt)
+    return dist
+
+
+def naive_paths(n):
+    """Counts lattice paths without memoization."""
+    if n[0] == 0 or n[1] == 0:
+        return 1
+    return naive_paths((n[0] - 1, n[1])) + naive_paths((n[0], n[1] - 1))
+
+
+@aoc_lib.memoized
+def memo_paths(n):
+    if n[0] == 0 or n[1] == 0:
+        return 1
+    return memo_paths((n[0] - 1, n[1])) + memo_paths((n[0], n[1] - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=300, help="Grid side length")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per timing")
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    lines = [''.join('#' if rng.random() < 0.25 else '.' for _ in range(args.size)) for _ in range(args.size)]
+    lines[0] = '.' + lines[0][1:]
+    data = '\n'.join(lines).encode()
+    grid = aoc_lib.ArrayGrid.from_bytes(data)
+    graph, width = aoc_lib.grid_graph(grid, b'.')
+
+    def compare(label, naive, helper):
+        naive_time = min(timeit.repeat(naive, number=args.repeat, repeat=3)) / args.repeat
+        helper_time = min(timeit.repeat(helper, number=args.repeat, repeat=3)) / args.repeat
+        print(f"{label:>16}: naive {naive_time * 1e3:9.2f} ms, aoc_lib {helper_time * 1e3:9.2f} ms "
+              f"({naive_time / helper_time:.1f}x)")
+
+    assert naive_neighbor_counts(lines) == grid.neighbor_counts(grid.cells == ord('#')).tolist()
+    compare('neighbor counts', lambda: naive_neighbor_counts(lines),
+            lambda: grid.neighbor_counts(grid.cells == ord('#')))
+
+    naive = naive_bfs(lines, (0, 0))
+    fast = aoc_lib.bfs(graph, 0)
+    assert all(fast[r * width + c] == d for (r, c), d in naive.items())
+    compare('bfs', lambda: naive_bfs(lines, (0, 0)), lambda: aoc_lib.bfs(graph, 0))
+    compare('bfs incl. build', lambda: naive_bfs(lines, (0, 0)),
+            lambda: aoc_lib.bfs(aoc_lib.grid_graph(grid, b'.')[0], 0))
+
+    def run_memo():
+        memo_paths.cache_clear()
+        return memo_paths((12, 12))
+    assert naive_paths((12, 12)) == run_memo()
+    compare('memoized paths', lambda: naive_paths((12, 12)), run_memo)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Batch benchmark and regression gate for test case extraction over a saved problem archive.
+
+Runs parsing, extract_examples and create_solution_template for every
+article in a process pool, the way main.py builds templates, and reports
+documents per second, p50/p99 latency per stage and, given a labels file,
+the accuracy of the test case and expected result each template gets.
+
+The labels file is JSON mapping article names (as printed by this script)
+to {"test_case": ..., "expected_result": ...}; either key may be left out.
+Write one from the current output with --write-labels, fix it by hand, and
+rerun with --min-accuracy to gate changes to the extractor.
+
+Usage: python benchmarks/bench_batch_extraction.py [corpus_dir] [--store DIR] [--labels FILE]
+           [--write-labels FILE] [--workers N] [--min-accuracy FRACTION]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import SAMPLE_LABELS, load_articles, load_store_articles
+import html_parser
+import test_case_extractor
+
+STAGES = ('parse', 'extract', 'template')
+
+
+def process_article(article):
+    """Runs every stage on one (name, html) article; returns (name, test_case, expected_result, seconds per stage)."""
+    name, html = article
+    timings = {}
+    start = time.perf_counter()
+    tree = html_parser.parse(html)
+    timings['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    examples = test_case_extractor.extract_examples(tree)
+    (test_case, expected_result), more_examples = examples[0], examples[1:]
+    timings['extract'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    test_case_extractor.create_solution_template(1, 1, test_case, expected_result, examples=more_examples)
+    timings['template'] = time.perf_counter() - start
+    return name, test_case, expected_result, timings
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def score(results, labels):
+    """Returns (correct, checked, failures) for every labeled field of the results."""
+    correct = checked = 0
+    failures = []
+    for name, test_case, expected_result, _ in results:
+        label = labels.get(name)
+        if not label:
+            continue
+        got = {'test_case': (test_case or '').strip(), 'expected_result': expected_result}
+        for field in ('test_case', 'expected_result'):
+            if field not in label:
+                continue
+            want = label[field].strip() if field == 'test_case' and label[field] else label[field]
+            checked += 1
+            if got[field] == want:
+                correct += 1
+            else:
+                failures.append((name, field, want, got[field]))
+    return correct, checked, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus_dir', nargs='?', help="Directory of saved AoC problem pages (*.html)")
+    parser.add_argument('--store', help="Content store directory to read pages from (see `main.py prefetch`)")
+    parser.add_argument('--labels', help="JSON file with the expected extraction per article")
+    parser.add_argument('--write-labels', help="Write the current extraction results as a labels file")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--min-accuracy', type=float, help="Exit with status 1 below this accuracy (0-1)")
+    args = parser.parse_args()
+
+    if args.store:
+        articles = load_store_articles(args.store)
+    else:
+        articles = load_articles(args.corpus_dir)
+    if args.labels:
+        with open(args.labels, 'r', encoding='utf-8') as f:
+            labels = json.load(f)
+    else:
+        labels = SAMPLE_LABELS
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunksize = max(1, len(articles) // (4 * (args.workers or 1)))
+        results = list(pool.map(process_article, articles, chunksize=chunksize))
+    wall = time.perf_counter() - start
+
+    print(f"{len(results)} articles in {wall:.2f}s with {args.workers} workers "
+          f"({len(results) / wall:.1f} documents/s)")
+    for stage in STAGES:
+        values = [timings[stage] for _, _, _, timings in results]
+        print(f"{stage:>9}: p50 {percentile(values, 0.5) * 1e3:.3f} ms, "
+              f"p99 {percentile(values, 0.99) * 1e3:.3f} ms")
+
+    if args.write_labels:
+        with open(args.write_labels, 'w', encoding='utf-8') as f:
+            json.dump({name: {'test_case': test_case, 'expected_result': expected_result}
+                       for name, test_case, expected_result, _ in results}, f, indent=1, sort_keys=True)
+        print(f"Wrote labels for {len(results)} articles to {args.write_labels}")
+
+    correct, checked, failures = score(results, labels)
+    if not checked:
+        print("No labeled articles, accuracy not measured")
+        return
+    for name, field, want, got in failures:
+        print(f"WRONG {field}: {name}: expected {want!r}, got {got!r}")
+    accuracy = correct / checked
+    print(f"Accuracy: {correct}/{checked} labeled fields ({accuracy:.1%})")
+    if args.min_accuracy is not None and accuracy < args.min_accuracy:
+        print(f"Accuracy below {args.min_accuracy:.1%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
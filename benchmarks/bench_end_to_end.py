@@ -0,0 +1,129 @@
+"""End-to-end latency benchmark of main.py against the local AoC stand-in.
+
+Every round shifts the stand-in clock to just before the next day's unlock
+and then runs the real pipeline: server clock calibration and unlock wait,
+concurrent fetch of problem text and input, template creation, and the
+solution monitor submitting answers written to solution1.txt/solution2.txt
+(part 1 first wrong, then right after the cooldown, then part 2).
+
+Reports, per round and as medians: wake-up error, unlock to input on disk,
+unlock to ready-to-solve, and solution written to verdict.
+
+Usage: python benchmarks/bench_end_to_end.py [--rounds N] [--latency S] [--jitter S] [--error-rate F]
+           [--cooldown S] [--store DIR] [--ledger FILE] [--real-budget] [--verbose]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import aoc_standin
+import answer_ledger
+import content_store
+import fetch_pipeline
+import main as aoc
+import rate_limiter
+
+
+def configure(workdir, base_url, year, real_budget):
+    """Points main.py at the stand-in and keeps all of its state inside `workdir`."""
+    cache_dir = os.path.join(workdir, 'cache')
+    aoc.BASE_URL = base_url
+    aoc.YEAR = year
+    aoc.SESSION_ID = 'standin'
+    aoc.CACHE_DIR = cache_dir
+    aoc.HTTP = None  # Recreated under the new CACHE_DIR on first use
+    aoc.STORE = content_store.ContentStore(os.path.join(cache_dir, 'content'))
+    aoc.LEDGER = answer_ledger.AnswerLedger(os.path.join(cache_dir, 'answers.json'))
+    aoc.TIMELINE_DIR = os.path.join(cache_dir, 'timelines')
+    if not real_budget:
+        aoc.RATE_LIMITER = rate_limiter.RateLimiter({'get': (0.01, 4), 'post': (0.01, 2), 'poll': (0.01, 4)})
+    os.chdir(workdir)
+
+
+def time_verdict(day, part, answer, timeout=120):
+    """Writes `answer` to the solution file and returns seconds until its verdict is in the ledger."""
+    start = time.time()
+    with open(f'solution{part}.txt', 'w') as f:
+        f.write(answer)
+    while answer not in aoc.LEDGER.entry(aoc.YEAR, day, part)['answers']:
+        if time.time() - start > timeout:
+            return None
+        time.sleep(0.001)
+    return time.time() - start
+
+
+def run_round(standin, day, lead):
+    """Runs one unlock-to-both-stars round for `day`; returns {metric: seconds}."""
+    for part in (1, 2):
+        if os.path.exists(f'solution{part}.txt'):
+            os.remove(f'solution{part}.txt')
+    true_unlock = standin.unlock_in(day, lead)
+
+    unlocked_at = aoc.wait_for_day(day)
+    timer = fetch_pipeline.StageTimer(true_unlock)
+    scheduler = aoc.prepare_day(day, unlocked_at=unlocked_at, timer=timer)
+    if scheduler is None:
+        raise RuntimeError(f"Could not prepare day {day}")
+    ends = {name: end for _, name, _, end in timer.stages}
+
+    correct = standin.day(day)[3]
+    result = {
+        'wake error': (unlocked_at - true_unlock) if unlocked_at else None,
+        'unlock -> input on disk': ends.get('download input'),
+        'unlock -> ready': max(ends.values()),
+        'part 1 wrong -> verdict': time_verdict(day, 1, str(int(correct[1]) + 1)),
+        'part 1 right (after cooldown) -> verdict': time_verdict(day, 1, correct[1]),
+        'part 2 right -> verdict': time_verdict(day, 2, correct[2]),
+    }
+    scheduler.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=3, help="Days to run, each with its own unlock")
+    parser.add_argument('--lead', type=float, default=3.0, help="Seconds between round start and unlock")
+    parser.add_argument('--latency', type=float, default=0.02, help="Stand-in latency per response")
+    parser.add_argument('--jitter', type=float, default=0.01, help="Extra random stand-in latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument('--cooldown', type=float, default=1.0, help="Stand-in wait after a wrong answer")
+    parser.add_argument('--year', type=int, default=time.localtime().tm_year + 1,
+                        help="Puzzle year; its December must still be ahead on the local clock")
+    parser.add_argument('--store', help="Content store to replay pages and inputs from")
+    parser.add_argument('--ledger', help="Answer ledger with the correct answers for replayed days")
+    parser.add_argument('--real-budget', action='store_true', help="Keep main.py's 15s request budget")
+    parser.add_argument('--verbose', action='store_true', help="Show main.py's output")
+    args = parser.parse_args()
+
+    standin = aoc_standin.AocStandIn(args.year, args.store, args.ledger, args.latency, args.jitter,
+                                     args.error_rate, args.cooldown)
+    server = aoc_standin.start(standin)
+    workdir = tempfile.mkdtemp(prefix='aoc_e2e_')
+    configure(workdir, f"http://localhost:{server.server_port}", args.year, args.real_budget)
+    print(f"Running {args.rounds} rounds for {args.year} in {workdir}")
+
+    results = []
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:  # main.py's monitor threads keep printing until the server is shut down
+        for day in range(1, args.rounds + 1):
+            results.append(run_round(standin, day, args.lead))
+        server.shutdown()
+
+    for day, result in enumerate(results, 1):
+        print(f"Day {day}: " + ', '.join(
+            f"{name} {value * 1e3:.1f} ms" if value is not None else f"{name} n/a"
+            for name, value in result.items()))
+
+    print(f"Median over {len(results)} rounds ({len(standin.requests)} stand-in requests):")
+    for name in results[0]:
+        values = [result[name] for result in results if result[name] is not None]
+        if values:
+            print(f"  {name:>42}: {statistics.median(values) * 1e3:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark and regression check for expected result extraction in test_case_extractor.
+
+Compares the previous loop of uncompiled re.search calls with the precompiled
+pattern table (find_expected_result) and the single-scan candidate finder
+(find_result_candidates), and checks that all three pick the same answer.
+
+Usage: python benchmarks/bench_expected_result.py [corpus_dir] [--repeat N]
+"""
+import argparse
+import re
+import timeit
+
+from bs4 import BeautifulSoup
+
+from corpus import load_articles
+import test_case_extractor
+
+
+def legacy_find_expected_result(text):
+    """The previous implementation, relying on the re module's pattern cache."""
+    for pattern, group in test_case_extractor.RESULT_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if match:
+            return match.group(group)
+    return None
+
+
+def best_candidate(text):
+    """Picks the leftmost candidate of the highest priority from a single scan."""
+    candidates = test_case_extractor.find_result_candidates(text)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: (c[2], c[1]))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus_dir', nargs='?', help="Directory of saved AoC problem pages (*.html)")
+    parser.add_argument('--repeat', type=int, default=50, help="Passes over the corpus per timing")
+    args = parser.parse_args()
+
+    texts = [(name, BeautifulSoup(html, 'html.parser').get_text())
+             for name, html in load_articles(args.corpus_dir)]
+
+    mismatches = 0
+    for name, text in texts:
+        answers = (legacy_find_expected_result(text),
+                   test_case_extractor.find_expected_result(text),
+                   best_candidate(text))
+        if len(set(answers)) != 1:
+            mismatches += 1
+            print(f"MISMATCH: {name}: legacy={answers[0]} table={answers[1]} scan={answers[2]}")
+
+    results = {}
+    for label, find in (('legacy', legacy_find_expected_result),
+                        ('table', test_case_extractor.find_expected_result),
+                        ('scan', test_case_extractor.find_result_candidates)):
+        seconds = min(timeit.repeat(lambda: [find(text) for _, text in texts],
+                                    number=args.repeat, repeat=3))
+        results[label] = seconds / (args.repeat * len(texts))
+        print(f"{label:>7}: {results[label] * 1e6:.1f} us per article")
+    print(f"{len(texts)} articles, {mismatches} mismatches, "
+          f"table speedup {results['legacy'] / results['table']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
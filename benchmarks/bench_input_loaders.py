@@ -0,0 +1,83 @@
+"""Benchmark of the input_loaders against the list-of-strings parse_input of older templates.
+
+Generates large synthetic inputs of each shape and times loading them into
+something a solution can work with.
+
+Usage: python benchmarks/bench_input_loaders.py [--size N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+import corpus  # noqa: F401  (puts the repo on sys.path)
+import input_loaders
+
+
+def read_lines(path):
+    """The old template path: decode, then build a list of stripped line strings."""
+    with open(path, 'r') as f:
+        input_text = f.read()
+    return [line.strip() for line in input_text.split('\n') if line.strip()]
+
+
+def old_ints(path):
+    return [int(token) for line in read_lines(path) for token in line.split()]
+
+
+def old_grid(path):
+    lines = read_lines(path)
+    return sum(row.count('#') for row in lines)
+
+
+def new_ints(path):
+    return input_loaders.parse_ints(input_loaders.map_input(path))
+
+
+def new_grid(path):
+    grid = input_loaders.parse_grid(input_loaders.map_input(path))
+    return grid.data.count(b'#')
+
+
+def new_lines(path):
+    return sum(1 for _ in input_loaders.iter_lines(input_loaders.map_input(path)))
+
+
+def old_line_count(path):
+    return len(read_lines(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000, help="Grid side length; other inputs scale with it")
+    parser.add_argument('--repeat', type=int, default=5, help="Loads per timing")
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    side = args.size
+    inputs = {
+        'ints': '\n'.join(f"{rng.randint(-10**9, 10**9)}   {rng.randint(0, 10**6)}" for _ in range(side * side // 20)),
+        'grid': '\n'.join(''.join(rng.choice('.#') for _ in range(side)) for _ in range(side)),
+        'lines': '\n'.join(f"{rng.randint(0, 99)},{rng.randint(0, 99)} -> {rng.randint(0, 99)}" for _ in range(side * 20)),
+    }
+    cases = {
+        'ints': (old_ints, new_ints),
+        'grid': (old_grid, new_grid),
+        'lines': (old_line_count, new_lines),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for shape, text in inputs.items():
+            path = os.path.join(tmp, f'{shape}.txt')
+            with open(path, 'w') as f:
+                f.write(text)
+            old, new = cases[shape]
+            old_time = min(timeit.repeat(lambda: old(path), number=args.repeat, repeat=3)) / args.repeat
+            new_time = min(timeit.repeat(lambda: new(path), number=args.repeat, repeat=3)) / args.repeat
+            print(f"{shape:>5} ({len(text) / 1e6:.1f} MB): list of strings {old_time * 1e3:8.2f} ms, "
+                  f"{new.__name__} {new_time * 1e3:8.2f} ms ({old_time / new_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
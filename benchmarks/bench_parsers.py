@@ -0,0 +1,71 @@
+"""Benchmark of the HTML parser backends on saved AoC problem pages.
+
+For every installed backend this times parsing a page once and extracting the
+test case from the shared tree, against the previous flow of parsing the page
+with html.parser and then parsing each article's HTML again for extraction.
+
+Usage: python benchmarks/bench_parsers.py [corpus_dir] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import timeit
+
+from bs4 import BeautifulSoup
+
+from corpus import SAMPLE_ARTICLES
+import html_parser
+import test_case_extractor
+
+
+def load_pages(corpus_dir):
+    """Returns the raw HTML of every saved page, or the sample articles wrapped in a page."""
+    pages = []
+    if corpus_dir and os.path.isdir(corpus_dir):
+        for path in sorted(glob.glob(os.path.join(corpus_dir, '**', '*.html'), recursive=True)):
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    if not pages:
+        print("No saved pages found, using built-in sample articles")
+        pages = [f"<html><body><main>{html}</main></body></html>" for _, html in SAMPLE_ARTICLES]
+    return pages
+
+
+def reparse_flow(page):
+    """Previous flow: parse the page, then parse every article's HTML again."""
+    soup = BeautifulSoup(page, 'html.parser')
+    return [test_case_extractor.extract_test_case(BeautifulSoup(str(article), 'html.parser'))
+            for article in soup.find_all('article', class_='day-desc')]
+
+
+def shared_tree_flow(page, backend):
+    """Current flow: parse once and extract from the article trees."""
+    soup = html_parser.parse(page, backend)
+    return [test_case_extractor.extract_test_case(article)
+            for article in soup.find_all('article', class_='day-desc')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus_dir', nargs='?', help="Directory of saved AoC problem pages (*.html)")
+    parser.add_argument('--repeat', type=int, default=20, help="Passes over the corpus per timing")
+    args = parser.parse_args()
+
+    pages = load_pages(args.corpus_dir)
+    print(f"{len(pages)} pages, backends: {', '.join(html_parser.available_backends())}")
+
+    def report(label, func):
+        seconds = min(timeit.repeat(lambda: [func(page) for page in pages], number=args.repeat, repeat=3))
+        print(f"{label:>28}: {seconds / (args.repeat * len(pages)) * 1e3:.3f} ms per page")
+
+    report('reparse (html.parser)', reparse_flow)
+    for backend in html_parser.available_backends():
+        report(f'parse only ({backend})', lambda page: html_parser.parse(page, backend))
+        report(f'shared tree ({backend})', lambda page: shared_tree_flow(page, backend))
+        mismatches = sum(reparse_flow(page) != shared_tree_flow(page, backend) for page in pages)
+        if mismatches:
+            print(f"{'':>28}  {mismatches} pages extract differently with {backend}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark: single-pass DocumentIndex vs. per-block tree walks in test_case_extractor.
+
+Usage: python benchmarks/bench_test_case_extractor.py [corpus_dir] [--repeat N]
+"""
+import argparse
+import re
+import timeit
+import warnings
+
+from bs4 import BeautifulSoup
+
+from corpus import load_articles
+import test_case_extractor
+
+
+def legacy_find_best_test_case(code_blocks, text):
+    """The previous implementation, which walks the tree twice per block."""
+    best_block = None
+    best_score = -1
+    for block in code_blocks:
+        block_text = block.text.strip()
+        prev_text = block.find_previous(text=True) or ''
+        next_text = block.find_next(text=True) or ''
+        score = 0
+        if re.search(r'example|instance|consider|for example', prev_text, re.IGNORECASE):
+            score += 3
+        if re.search(r'final example|larger example|complete example', prev_text, re.IGNORECASE):
+            score += 5
+        if re.search(r'produces|result|total|sum|count|distance', next_text, re.IGNORECASE):
+            score += 2
+        if re.search(r'rules?:|sequences?:', prev_text, re.IGNORECASE):
+            score += 4
+        score += len(block_text.split('\n'))
+        if score > best_score:
+            best_score = score
+            best_block = block_text
+    return best_block
+
+
+def legacy_extract(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    text = soup.get_text()
+    code_blocks = soup.find_all('pre')
+    if code_blocks:
+        return legacy_find_best_test_case(code_blocks, text), text
+    return test_case_extractor.find_inline_example(text), text
+
+
+def indexed_extract(html):
+    index = test_case_extractor.DocumentIndex(BeautifulSoup(html, 'html.parser'))
+    if index.blocks:
+        return test_case_extractor.find_best_test_case(index), index.text
+    return test_case_extractor.find_inline_example(index.text), index.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus_dir', nargs='?', help="Directory of saved AoC problem pages (*.html)")
+    parser.add_argument('--repeat', type=int, default=20, help="Passes over the corpus per timing")
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', DeprecationWarning)  # find_previous(text=...) in the legacy path
+
+    articles = load_articles(args.corpus_dir)
+    mismatches = [name for name, html in articles if legacy_extract(html) != indexed_extract(html)]
+    for name in mismatches:
+        print(f"MISMATCH: {name}")
+
+    results = {}
+    for label, extract in (('legacy', legacy_extract), ('indexed', indexed_extract)):
+        seconds = min(timeit.repeat(lambda: [extract(html) for _, html in articles],
+                                    number=args.repeat, repeat=3))
+        results[label] = seconds / (args.repeat * len(articles))
+        print(f"{label:>8}: {results[label] * 1e3:.3f} ms per article")
+    print(f"{len(articles)} articles, {len(mismatches)} mismatches, "
+          f"speedup {results['legacy'] / results['indexed']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Loads saved AoC problem pages for the benchmarks."""
+import glob
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+# Make the helper modules importable when running `python benchmarks/<script>.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Used when no saved pages are available, so the benchmarks always have something to run on
+SAMPLE_ARTICLES = [
+    ('sample/day1-part1', """<article class="day-desc"><h2>--- Day 1: Sample Lists ---</h2>
+<p>The elves have two lists of location IDs. For example:</p>
+<pre><code>3   4
+4   3
+2   5
+1   3
+3   9
+3   3
+</code></pre>
+<p>Pair up the smallest numbers in each list and add up the distances between them.</p>
+<p>In the example above, this produces a <em>total distance of 11</em>.</p>
+</article>"""),
+    ('sample/day4-part1', """<article class="day-desc"><h2>--- Day 4: Sample Search ---</h2>
+<p>Consider this small grid:</p>
+<pre><code>..X...
+.SAMX.
+.A..A.
+XMAS.S
+.X....
+</code></pre>
+<p>Here is a larger example:</p>
+<pre><code>MMMSXXMASM
+MSAMXMSMSA
+AMXSXMAAMM
+MSAMASMSMX
+XMASAMXAMM
+XXAMMXXAMA
+SMSMSASXSS
+SAXAMASAAA
+MAMMMXMMMM
+MXMXAXMASX
+</code></pre>
+<p>In this word search, <code>XMAS</code> occurs a total of <code><em>18</em></code> times.</p>
+</article>"""),
+    ('sample/day5-part1', """<article class="day-desc"><h2>--- Day 5: Sample Queue ---</h2>
+<p>The page ordering rules and the updates are given like this:</p>
+<p>For example, rules:</p>
+<pre><code>47|53
+97|13
+97|61
+
+75,47,61,53,29
+97,61,53,29,13
+</code></pre>
+<p>Adding together the middle page numbers of the correct updates produces <code><em>143</em></code>.</p>
+</article>"""),
+]
+
+
+# Expected extraction results for SAMPLE_ARTICLES, in the labels format of bench_batch_extraction.py
+SAMPLE_LABELS = {
+    'sample/day1-part1': {'expected_result': '11'},
+    'sample/day4-part1': {'expected_result': '18'},
+    'sample/day5-part1': {'expected_result': '143'},
+}
+
+
+def split_articles(name, html):
+    """Returns [(name#partN, article html)] for a saved page, or [(name, html)] if it has no articles."""
+    found = BeautifulSoup(html, 'html.parser').find_all('article', class_='day-desc')
+    if not found:
+        return [(name, html)]
+    return [(f"{name}#part{part}", str(article)) for part, article in enumerate(found, 1)]
+
+
+def load_store_articles(store_dir):
+    """Returns [(year/day, article html)] for every problem page in a content store (see `main.py prefetch`)."""
+    import content_store
+    store = content_store.ContentStore(store_dir)
+    articles = []
+    for index_path in sorted(glob.glob(os.path.join(store_dir, '[0-9]*', '*.json'))):
+        year = int(os.path.basename(os.path.dirname(index_path)))
+        day = int(os.path.splitext(os.path.basename(index_path))[0])
+        page = store.get(year, day, 'page')
+        if page is not None:
+            articles.extend(split_articles(f"{year}/day{day:02d}", page.decode('utf-8')))
+    return sorted(articles, key=lambda article: article[0])
+
+
+def load_articles(corpus_dir=None):
+    """Returns [(name, article html)] for every day-desc article in the saved pages under corpus_dir.
+
+    Falls back to SAMPLE_ARTICLES when corpus_dir is missing or holds no pages.
+    """
+    articles = []
+    if corpus_dir and os.path.isdir(corpus_dir):
+        for path in sorted(glob.glob(os.path.join(corpus_dir, '**', '*.html'), recursive=True)):
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            articles.extend(split_articles(os.path.relpath(path, corpus_dir), html))
+    if not articles:
+        print("No saved pages found, using built-in sample articles")
+        articles = list(SAMPLE_ARTICLES)
+    return articles
@@ -0,0 +1,79 @@
+"""Module for storing fetched problem pages and inputs per year and day."""
+import hashlib
+import json
+import os
+import threading
+
+
+def write_atomic(path, chunks, mode='wb'):
+    """Writes `chunks` to a temporary file as they come and moves it to `path` when complete."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ContentStore:
+    """Content-addressed store of puzzle data.
+
+    Blobs live under `objects/` named by their SHA-256, and a small index per
+    year and day (`<year>/<day>.json`) maps a kind ('page', 'input') to a
+    blob. Every item is committed as soon as it is fetched, so an interrupted
+    prefetch resumes where it stopped.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _index_path(self, year, day):
+        return os.path.join(self.root, str(year), f"{day}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def _index(self, year, day):
+        try:
+            with open(self._index_path(year, day), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def path(self, year, day, kind):
+        """Returns the blob file holding `kind` for a day, or None if it is not stored."""
+        digest = self._index(year, day).get(kind)
+        if digest is None:
+            return None
+        blob_path = self._blob_path(digest)
+        return blob_path if os.path.exists(blob_path) else None
+
+    def has(self, year, day, kind):
+        return self.path(year, day, kind) is not None
+
+    def get(self, year, day, kind):
+        """Returns the stored bytes of `kind` for a day, or None."""
+        blob_path = self.path(year, day, kind)
+        if blob_path is None:
+            return None
+        with open(blob_path, 'rb') as f:
+            return f.read()
+
+    def put(self, year, day, kind, data):
+        """Stores `data` (bytes) as `kind` for a day and returns its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            write_atomic(blob_path, [data])
+        with self._lock:
+            index_path = self._index_path(year, day)
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            index = self._index(year, day)
+            index[kind] = digest
+            write_atomic(index_path, [json.dumps(index)], 'w')
+        return digest
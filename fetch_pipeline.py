@@ -0,0 +1,43 @@
+"""Module for running the fetch stages of a day concurrently with asyncio and timing them."""
+import asyncio
+import time
+
+
+class StageTimer:
+    """Runs blocking stages in worker threads and records when each one ran.
+
+    Stages belong to a chain (e.g. 'problem' or 'input'); stages of one chain
+    run one after another, different chains run concurrently. Times are
+    relative to `origin`, e.g. the local unlock time.
+    """
+    def __init__(self, origin=None):
+        self.origin = time.time() if origin is None else origin
+        self.stages = []  # (chain, name, start, end)
+
+    async def run(self, chain, name, func, *args):
+        """Runs `func(*args)` in a worker thread as stage `name` of `chain` and returns its result."""
+        start = time.time()
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            self.stages.append((chain, name, start - self.origin, time.time() - self.origin))
+
+    def critical_path(self):
+        """Returns the stages of the chain that finished last."""
+        if not self.stages:
+            return []
+        last_chain = max(self.stages, key=lambda stage: stage[3])[0]
+        return [stage for stage in self.stages if stage[0] == last_chain]
+
+    def report(self):
+        """Returns a per-stage timing table with the critical path marked by '*'."""
+        critical = self.critical_path()
+        lines = []
+        for stage in sorted(self.stages, key=lambda stage: stage[2]):
+            chain, name, start, end = stage
+            marker = '*' if stage in critical else ' '
+            lines.append(f"{marker} {chain:<8} {name:<20} {start:8.3f}s -> {end:8.3f}s ({end - start:.3f}s)")
+        if critical:
+            lines.append(f"Ready to solve at {critical[-1][3]:.3f}s (critical path: {critical[0][0]})")
+        return '\n'.join(lines)
+
@@ -0,0 +1,33 @@
+"""Module for parsing HTML once with the fastest available BeautifulSoup tree builder."""
+from bs4 import BeautifulSoup, FeatureNotFound
+from bs4.element import Tag
+
+# Tree builders in order of preference; html.parser is always available
+PREFERRED_BACKENDS = ['lxml', 'html.parser']
+
+def available_backends():
+    """Returns the installed tree builders in order of preference."""
+    backends = []
+    for backend in PREFERRED_BACKENDS:
+        try:
+            BeautifulSoup('', backend)
+        except FeatureNotFound:
+            continue
+        backends.append(backend)
+    return backends
+
+BACKEND = available_backends()[0]
+
+def parse(html, backend=None):
+    """Parses an HTML document with the preferred (or given) backend."""
+    return BeautifulSoup(html, backend or BACKEND)
+
+def as_tree(document):
+    """Returns `document` unchanged if it is already parsed, otherwise parses it.
+    
+    Lets callers pass a Tag from an already parsed response instead of
+    serializing it and parsing it again.
+    """
+    if isinstance(document, Tag):
+        return document
+    return parse(document)
@@ -0,0 +1,168 @@
+"""Module for a pooled HTTP session backed by an on-disk conditional-GET response cache."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from content_store import write_atomic
+
+
+class CachedSession:
+    """Pooled requests session whose GET responses are cached on disk.
+
+    Responses are keyed by URL and session cookie. Cached responses carry
+    their ETag/Last-Modified validators, so a repeated GET is sent as a
+    conditional request and a 304 is answered from disk. URLs for which
+    `is_immutable(url)` is true (e.g. puzzle inputs) are answered from disk
+    without any request at all.
+    """
+    def __init__(self, cache_dir, headers=None, is_immutable=None):
+        self.cache_dir = cache_dir
+        self.is_immutable = is_immutable or (lambda url: False)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _paths(self, url, cookies):
+        session_id = (cookies or {}).get('session', '')
+        key = hashlib.sha256(f"{url}\0{session_id}".encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _load(self, url, cookies):
+        meta_path, body_path = self._paths(url, cookies)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def _store(self, url, cookies, response, body=None):
+        meta_path, body_path = self._paths(url, cookies)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'headers': {k: v for k, v in response.headers.items()
+                        if k.lower() in ('content-type', 'date', 'etag', 'last-modified')},
+            'encoding': response.encoding,
+            'stored_at': time.time(),
+        }
+        body = response.content if body is None else body
+        for path, data, mode in ((body_path, body, 'wb'),
+                                 (meta_path, json.dumps(meta), 'w')):
+            write_atomic(path, [data], mode)
+
+    def _from_cache(self, url, meta, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = meta.get('encoding')
+        response.from_cache = True
+        return response
+
+    def lookup(self, url, cookies=None, dest=None):
+        """Returns the cached response for an immutable URL, or None if it needs a request.
+        
+        With `dest`, the body is also written to that file.
+        """
+        if not self.is_immutable(url):
+            return None
+        meta, body = self._load(url, cookies)
+        if meta is None:
+            return None
+        self._count('hits')
+        if dest is not None:
+            write_atomic(dest, [body])
+        return self._from_cache(url, meta, body)
+
+    def _stream(self, response, dest, chunk_size=65536):
+        """Writes the body of a streamed response to `dest` as it arrives and returns it."""
+        chunks = []
+        def receive():
+            for chunk in response.iter_content(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+        write_atomic(dest, receive())
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        return response._content
+
+    def get(self, url, cookies=None, dest=None, **kwargs):
+        """Sends a (conditional) GET; 304 responses are turned into the cached 200 response.
+        
+        With `dest`, a successful response body is streamed into that file
+        while it downloads.
+        """
+        meta, body = self._load(url, cookies)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.session.get(url, cookies=cookies, headers=headers,
+                                    stream=dest is not None, **kwargs)
+        if response.status_code == 304 and meta is not None:
+            self._count('revalidated')
+            cached = self._from_cache(url, meta, body)
+            cached.headers.update(response.headers)
+            if dest is not None:
+                write_atomic(dest, [body])
+            return cached
+        if response.status_code == 200:
+            self._count('misses')
+            body = self._stream(response, dest) if dest is not None else None
+            self._store(url, cookies, response, body)
+        return response
+
+    def prewarm(self, url):
+        """Opens a connection to the host of `url` and parks it in the pool without sending a request.
+
+        The TCP and TLS handshakes are then already done when the next
+        request to that host goes out. Returns True if a connection was opened.
+        """
+        adapter = self.session.get_adapter(url)
+        try:
+            if hasattr(adapter, 'get_connection_with_tls_context'):
+                # Use the same TLS settings as a real request so the connection lands in its pool
+                settings = self.session.merge_environment_settings(url, {}, None, None, None)
+                request = requests.Request('GET', url).prepare()
+                pool = adapter.get_connection_with_tls_context(
+                    request, settings['verify'], settings['proxies'], settings['cert'])
+            else:
+                pool = adapter.get_connection(url)
+            conn = pool._get_conn()
+            conn.connect()
+            pool._put_conn(conn)
+            return True
+        except Exception as e:
+            print(f"Could not pre-warm connection: {e}")
+            return False
+
+    def post(self, url, **kwargs):
+        """Sends an uncached POST over the pooled session."""
+        return self.session.post(url, **kwargs)
@@ -0,0 +1,126 @@
+"""Module for loading puzzle input from memory-mapped bytes into compact structures."""
+import io
+import mmap
+import re
+from array import array
+
+INT_RE = re.compile(rb'-?\d+')
+NOT_INT_RE = re.compile(rb'[^\d\s-]')
+
+
+def map_input(path='input.txt'):
+    """Returns the file's contents as a read-only memory map (or b'' for an empty file)."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b''  # Empty files cannot be mapped
+
+
+def parse_ints(data):
+    """Returns every integer in the input as a compact array of 64-bit ints."""
+    if not NOT_INT_RE.search(data):
+        return array('q', map(int, bytes(data).split()))  # Only whitespace between numbers
+    return array('q', map(int, INT_RE.findall(data)))
+
+
+def iter_lines(data):
+    """Lazily yields every non-blank line of the input as stripped bytes."""
+    if not isinstance(data, mmap.mmap):
+        data = io.BytesIO(data)
+    else:
+        data.seek(0)
+    for line in iter(data.readline, b''):
+        line = line.strip()
+        if line:
+            yield line
+
+
+class Grid:
+    """2D character grid stored as one contiguous byte buffer.
+
+    Cells are bytes values (use chr() or compare with b'#'[0]) indexed by
+    (row, col). Rows keep their line endings in the buffer, so loading a grid
+    needs no per-row copies.
+    """
+    __slots__ = ('data', 'width', 'height', 'stride')
+
+    def __init__(self, data, width, height, stride):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.stride = stride
+
+    def __getitem__(self, pos):
+        row, col = pos
+        return self.data[row * self.stride + col]
+
+    def __contains__(self, pos):
+        row, col = pos
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get(self, pos, default=None):
+        return self[pos] if pos in self else default
+
+    def row(self, row):
+        start = row * self.stride
+        return self.data[start:start + self.width]
+
+    def find(self, char):
+        """Returns (row, col) of the first cell equal to `char` (bytes or int), or None."""
+        index = self.data.find(bytes([char]) if isinstance(char, int) else char)
+        if index < 0:
+            return None
+        return divmod(index, self.stride)
+
+    def find_all(self, char):
+        """Yields (row, col) of every cell equal to `char` (bytes or int)."""
+        needle = bytes([char]) if isinstance(char, int) else char
+        index = self.data.find(needle)
+        while index >= 0:
+            yield divmod(index, self.stride)
+            index = self.data.find(needle, index + 1)
+
+    def neighbors4(self, pos):
+        row, col = pos
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < self.height and 0 <= c < self.width:
+                yield r, c
+
+    def __repr__(self):
+        return f"Grid({self.height}x{self.width})"
+
+
+def parse_grid(data):
+    """Returns the input as a Grid over a single copy of its bytes."""
+    data = bytes(data).strip()
+    width = data.find(b'\n')
+    if width < 0:
+        return Grid(data, len(data), 1 if data else 0, len(data) + 1)
+    stride = width + 1
+    if width > 0 and data[width - 1:width] == b'\r':
+        width -= 1  # Windows line endings
+    return Grid(data, width, (len(data) + stride - width) // stride, stride)
+
+
+GRID_LINE_RE = re.compile(r'[^\s,:;]+')
+NUMBER_LIST_RE = re.compile(r'\d+(?:[^\d\s]+\d+)+')
+
+
+def detect_loader(test_case):
+    """Picks a loader name ('grid', 'ints' or 'lines') from the shape of an example input."""
+    lines = [line.strip() for line in (test_case or '').split('\n') if line.strip()]
+    if not lines:
+        return 'lines'
+    if (len(lines) > 1 and len(lines[0]) > 1 and len({len(line) for line in lines}) == 1
+            and all(GRID_LINE_RE.fullmatch(line) and not NUMBER_LIST_RE.fullmatch(line) for line in lines)):
+        if all(line.isdigit() for line in lines):
+            return 'lines'  # Equal-width numbers or a digit map; too ambiguous to guess
+        return 'grid'
+    # Only when the flat array loses nothing: one integer per line, or one line of several
+    # integers. Rows of numbers keep their boundaries and digit strings stay text as 'lines'.
+    if len(lines) > 1 and all(re.fullmatch(r'-?\d+', line) for line in lines):
+        return 'ints'
+    if len(lines) == 1 and re.fullmatch(r'-?\d+(?:[\s,]+-?\d+)+', lines[0]):
+        return 'ints'
+    return 'lines'
@@ -1,16 +1,20 @@
+import functools
 import sys
-import requests
 import time
 import os
 import re
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-import pytz
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
-import json
+import answer_ledger
+import content_store
+import metrics
 import problem_text_processor
-import test_case_extractor
+import rate_limiter
+import retry_policy
+import submission_scheduler
+import unlock_scheduler
+
+# Heavy modules (requests, bs4, asyncio, http.server, multiprocessing) are imported
+# in the functions that need them, so commands like `ledger` or `switch` start fast
 
 # Your session cookie from adventofcode.com
 SESSION_ID = ""
@@ -20,380 +24,767 @@ HEADERS = {
     'User-Agent': 'github.com/your-username/aoc_helper by your-email@example.com'  # TODO: Update with your info
 }
 
+# Puzzle year (override with --year) and site (override with AOC_BASE_URL, e.g. for benchmarks/aoc_standin.py)
+YEAR = 2024
+BASE_URL = os.environ.get('AOC_BASE_URL', "https://adventofcode.com")
+
+# Local state shared by all runs (rate limit budget, response cache, answer ledger)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'aoc_helper')
+
 # Rate limiting settings
-MIN_REQUEST_INTERVAL = 15  # Minimum seconds between requests
-last_request_time = 0
-
-# Global variables for problem text
-problem_data = {
-    "part1": None,
-    "part2": None,
-    "day": None
-}
+MIN_REQUEST_INTERVAL = 15  # Minimum average seconds between requests
+RATE_LIMIT_STATE = os.path.join(CACHE_DIR, 'rate_limit.json')
+RATE_LIMITER = rate_limiter.RateLimiter({
+    'get': (MIN_REQUEST_INTERVAL, 2),  # Allows fetching problem and input back to back
+    'post': (MIN_REQUEST_INTERVAL, 1),
+    'poll': (2, 4),  # Bounded re-polling of a 404 right after unlock
+}, state_file=RATE_LIMIT_STATE)
 
-def throttle_request():
-    """Ensures minimum delay between requests to respect rate limits."""
-    global last_request_time
-    current_time = time.time()
-    time_since_last = current_time - last_request_time
-    if time_since_last < MIN_REQUEST_INTERVAL:
-        sleep_time = MIN_REQUEST_INTERVAL - time_since_last
-        time.sleep(sleep_time)
-    last_request_time = time.time()
-
-class ProblemHandler(SimpleHTTPRequestHandler):
-    """Handles HTTP requests for the local problem viewer."""
-    def do_GET(self):
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            
-            with open('problem.html', 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.wfile.write(content.encode())
-        
-        elif self.path == '/problem-data':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(problem_data).encode())
-        
-        else:
-            super().do_GET()
-    
-    def log_message(self, format, *args):
-        # Suppress logging
-        pass
-
-def start_server(port=8000):
-    """Starts local HTTP server for problem viewing."""
-    server = HTTPServer(('localhost', port), ProblemHandler)
-    server_thread = threading.Thread(target=server.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
-    return server
-
-def create_html_template(day):
-    """Creates HTML template for problem viewing."""
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>Advent of Code 2024 - Day {day}</title>
-    <style>
-        body {{
-            font-family: 'Source Code Pro', monospace;
-            background-color: #0f0f23;
-            color: #cccccc;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 1em;
-        }}
-        h1, h2 {{
-            color: #00cc00;
-            text-shadow: 0 0 2px #00cc00, 0 0 5px #00cc00;
-        }}
-        .problem-text {{
-            line-height: 1.5;
-            margin: 1em 0;
-        }}
-        pre {{
-            background-color: #10101a;
-            padding: 1em;
-            border-radius: 4px;
-            overflow-x: auto;
-        }}
-        code {{
-            color: #ffffff;
-        }}
-        #part2 {{
-            margin-top: 2em;
-            padding-top: 1em;
-            border-top: 1px solid #333340;
-        }}
-    </style>
-</head>
-<body>
-    <h1>Advent of Code 2024 - Day {day}</h1>
-    <div id="part1" class="problem-text"></div>
-    <div id="part2" class="problem-text"></div>
-
-    <script>
-        function updateProblemText() {{
-            fetch('/problem-data')
-                .then(response => response.json())
-                .then(data => {{
-                    if (data.part1) {{
-                        document.getElementById('part1').innerHTML = data.part1;
-                    }}
-                    if (data.part2) {{
-                        document.getElementById('part2').innerHTML = data.part2;
-                    }}
-                }});
-        }}
-
-        // Update initially and every 5 seconds
-        updateProblemText();
-        setInterval(updateProblemText, 5000);
-    </script>
-</body>
-</html>
-"""
-    with open('problem.html', 'w', encoding='utf-8') as f:
-        f.write(html)
-
-def fetch_with_retry(url, cookies, max_retries=float('inf')):
-    """Makes HTTP GET request with retry logic and rate limiting."""
-    throttle_request()  # Ensure minimum delay between requests
+# Retry settings
+RETRY_POLICY = retry_policy.RetryPolicy()
+BREAKER = retry_policy.CircuitBreaker()
+
+# Server clock offset, estimated from the Date header of every response
+SERVER_CLOCK = unlock_scheduler.ServerClock()
+
+# Pooled HTTP session, created on first use by http_session()
+HTTP = None
+HTTP_LOCK = threading.Lock()
+
+def http_session():
+    """Returns the pooled HTTP session; puzzle inputs never change, so they are served from the cache."""
+    global HTTP
+    with HTTP_LOCK:
+        if HTTP is None:
+            import http_cache
+            HTTP = http_cache.CachedSession(
+                os.path.join(CACHE_DIR, 'responses'),
+                headers=HEADERS,
+                is_immutable=lambda url: url.endswith('/input'),
+            )
+            HTTP.session.hooks['response'].append(SERVER_CLOCK.response_hook)
+        return HTTP
+
+# Timing spans and counters, served at /metrics and written to a timeline per day
+METRICS = metrics.Metrics()
+TIMELINE_DIR = os.path.join(CACHE_DIR, 'timelines')
+
+# Problem pages and inputs of every fetched day, see `python main.py prefetch`
+STORE = content_store.ContentStore(os.path.join(CACHE_DIR, 'content'))
+
+# Submitted answers and their verdicts, used to reject known-bad answers locally
+LEDGER = answer_ledger.AnswerLedger(os.path.join(CACHE_DIR, 'answers.json'))
+
+def throttle_request(kind='get'):
+    """Waits for a free slot in the shared rate limit budget for this kind of request."""
+    wait = RATE_LIMITER.acquire(kind)
+    METRICS.count('throttle_wait_seconds_total', wait)
+    return wait
+
+def metrics_counters():
+    """Returns the response cache statistics as counters (Metrics.snapshot merges them with METRICS')."""
+    return {f'http_cache_{name}_total': value for name, value in http_session().stats.items()}
+
+@METRICS.timed()
+def fetch_with_retry(url, cookies, max_retries=float('inf'), dest=None):
+    """Makes HTTP GET request with retry logic and rate limiting.
+    
+    RETRY_POLICY decides per status code whether and when to retry; BREAKER
+    holds requests back after repeated failures. With `dest`, the body is
+    streamed into that file. Returns None when giving up.
+    """
+    import requests
+    
+    cached = http_session().lookup(url, cookies, dest=dest)
+    if cached is not None:
+        METRICS.count('cache_hits_total')
+        return cached  # Local hit, costs no request budget
+    
     retries = 0
+    outcome = None
     while True:
+        hold = BREAKER.time_until_probe()
+        if hold > 0:
+            print(f"Too many failed requests, pausing {hold:.0f} seconds...")
+            time.sleep(hold)
+        # Every attempt waits for its own slot in the budget; unlock polls have their own small one
+        throttle_request('poll' if outcome == retry_policy.NOT_UNLOCKED else 'get')
+        response = None
+        METRICS.count('requests_total')
         try:
-            response = requests.get(url, cookies=cookies, headers=HEADERS)
-            if response.status_code == 200:
+            with METRICS.span('http_get', url=url):
+                response = http_session().get(url, cookies=cookies, dest=dest)
+            outcome = retry_policy.classify(response.status_code)
+            if outcome == retry_policy.OK:
+                BREAKER.record_success()
                 return response
-            print(f"Request failed with status code: {response.status_code}")
+            print(f"Request failed with status code: {response.status_code} ({outcome})")
         except requests.RequestException as e:
+            outcome = retry_policy.NETWORK_ERROR
             print(f"Request error: {e}")
         
+        if outcome in (retry_policy.SERVER_ERROR, retry_policy.NETWORK_ERROR, retry_policy.RATE_LIMITED):
+            if BREAKER.record_failure():
+                print(f"Circuit breaker open after {BREAKER.failures} failures")
+        
         retries += 1
         if retries >= max_retries:
             print(f"Max retries ({max_retries}) reached. Giving up.")
             return None
         
-        print(f"Retrying in {MIN_REQUEST_INTERVAL} seconds... (attempt {retries + 1})")
-        time.sleep(MIN_REQUEST_INTERVAL)
-
-def get_next_puzzle_time():
-    """Returns datetime of next puzzle unlock in EST timezone."""
-    url = "https://adventofcode.com/2024"
-    response = fetch_with_retry(url, {'session': SESSION_ID})
-    if not response:
-        return None
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    countdown = soup.find('div', class_='countdown')
-    if not countdown:
-        return None
-
-    countdown_text = countdown.get_text()
-    if "unlock" not in countdown_text.lower():
-        return None
+        retry_after = retry_policy.parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        since_unlock = unlock_scheduler.seconds_since_unlock(SERVER_CLOCK.now())
+        delay = RETRY_POLICY.next_delay(outcome, retries, retry_after, since_unlock)
+        if delay is None:
+            print(f"Not retrying ({outcome}). Giving up.")
+            return None
+        
+        METRICS.count('retries_total')
+        print(f"Retrying in {delay:.2f} seconds... (attempt {retries + 1})")
+        time.sleep(delay)
 
-    time_parts = [int(t) for t in countdown_text.split() if t.isdigit()]
-    if not time_parts:
-        return None
+def calibrate_server_clock():
+    """Calibrates SERVER_CLOCK from the Date header of a request for the year's calendar."""
+    fetch_with_retry(f"{BASE_URL}/{YEAR}", {'session': SESSION_ID}, max_retries=3)
 
-    est = pytz.timezone('US/Eastern')
-    now = datetime.now(est)
-    target = datetime(now.year, now.month, now.day, 0, 0, 0, tzinfo=est)
-    if now.hour >= 0:
-        target += timedelta(days=1)
+def wait_for_day(day):
+    """Waits until the puzzle for given day unlocks; returns the local unlock time, or None if it is out.
     
-    return target
+    The unlock time is computed locally, so an unlocked day costs no request.
+    """
+    unlock_at = unlock_scheduler.unlock_time(YEAR, day)
+    if unlock_at.timestamp() <= SERVER_CLOCK.now():
+        return None
+    calibrate_server_clock()
+    wait_time = unlock_at.timestamp() - SERVER_CLOCK.now()
+    print(f"Waiting {wait_time:.0f} seconds for day {day} "
+          f"(server clock offset {SERVER_CLOCK.offset:+.3f}s)...")
+    return unlock_scheduler.wait_for_unlock(
+        unlock_at, SERVER_CLOCK, prewarm=lambda: http_session().prewarm(f"{BASE_URL}/"))
 
-def handle_wait_time(message, part):
-    """Extracts wait time from response message and handles solution file."""
+def handle_wait_time(message):
+    """Extracts wait time in seconds from a response message, or None if there is none."""
     wait_match = re.search(r'wait (\d+)s', message) or re.search(r'have (\d+)s left to wait', message)
     if wait_match:
-        wait_time = int(wait_match.group(1))
-        solution_file = f'solution{part}.txt'
-        if os.path.exists(solution_file):
-            os.remove(solution_file)
-            print(f"Deleted {solution_file} - will retry in {wait_time} seconds")
-        return wait_time
+        return int(wait_match.group(1))
     return None
 
+def reject_solution_file(part, answer, reason):
+    """Deletes the solution file of an answer that was wrong, unless it already holds a new answer."""
+    solution_file = f'solution{part}.txt'
+    try:
+        with open(solution_file, 'r') as f:
+            if f.read().strip() != answer:
+                return
+        os.remove(solution_file)
+    except (OSError, UnicodeDecodeError):
+        return
+    print(f"Deleted {solution_file} - {reason}")
+
+@METRICS.timed()
 def submit_answer(day, part, answer):
-    """Submits solution to AoC and returns (success, message)."""
-    throttle_request()  # Ensure minimum delay between requests
-    url = f"https://adventofcode.com/2024/day/{day}/answer"
+    """Submits solution to AoC and returns (success, message).
+    
+    Answers the ledger already knows to be wrong are rejected locally,
+    without a request.
+    """
+    import html_parser
+
+    answer = str(answer)
+    if LEDGER.entry(YEAR, day, part)['correct'] == answer:
+        return True, "Correct answer! (already accepted)"
+    rejection = LEDGER.check(YEAR, day, part, answer)
+    if rejection:
+        print(f"\nNot submitting part {part}: {rejection}")
+        reject_solution_file(part, answer, "answer is known to be wrong")
+        return False, rejection
+    
+    throttle_request('post')  # Ensure minimum delay between submissions
+    url = f"{puzzle_url(YEAR, day)}/answer"
     data = {
         'level': str(part),
-        'answer': str(answer)
+        'answer': answer
     }
     cookies = {'session': SESSION_ID}
     
     print(f"\nSubmitting answer for part {part}: {answer}")
-    response = requests.post(url, data=data, cookies=cookies, headers=HEADERS)
+    METRICS.count('submissions_total')
+    with METRICS.span('http_post', url=url):
+        response = http_session().post(url, data=data, cookies=cookies)
     if response.status_code != 200:
         return False, "Failed to submit answer"
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = html_parser.parse(response.text)
     message = soup.find('article').text.strip()
     print(f"Server response: {message}")
     
     # Check for wait time
-    wait_time = handle_wait_time(message, part)
+    wait_time = handle_wait_time(message)
     if wait_time is not None:
-        return False, f"Need to wait {wait_time} seconds"
+        return False, f"Need to wait {wait_time}s"
     
-    if "That's the right answer" in message:
+    verdict = answer_ledger.verdict_from_message(message)
+    if verdict is not None:
+        LEDGER.record(YEAR, day, part, answer, verdict)
+    
+    if verdict == answer_ledger.VERDICT_CORRECT:
         return True, "Correct answer!"
     else:
         # Wrong answer, delete solution file
-        solution_file = f'solution{part}.txt'
-        if os.path.exists(solution_file):
-            os.remove(solution_file)
-            print(f"Deleted {solution_file} - answer was wrong")
+        reject_solution_file(part, answer, "answer was wrong")
         return False, message
 
-def update_problem_text(day):
-    """Fetches problem description and updates global problem_data."""
-    base_url = f"https://adventofcode.com/2024/day/{day}"
+def puzzle_url(year, day):
+    """Returns the URL of the problem page for given year and day."""
+    return f"{BASE_URL}/{year}/day/{day}"
+
+def fetch_problem_page(day, cached=False):
+    """Fetches the problem page for given day and returns its HTML, or None.
+    
+    With `cached`, a page from the content store is used without a request.
+    A stored page without part 2 is not used once the ledger shows part 1
+    solved, and otherwise revalidated in the background, so part 2 still
+    shows up when it was solved elsewhere. Fetched pages are saved to the store.
+    """
+    if cached:
+        page = STORE.get(YEAR, day, 'page')
+        has_part2 = page is not None and page.count(b'<article class="day-desc"') > 1
+        if page is not None and not has_part2 and LEDGER.entry(YEAR, day, 1)['correct'] is not None:
+            page = None  # Stored before part 1 was solved
+        if page is not None:
+            print("Problem page loaded from the content store")
+            if not has_part2:
+                refresh_thread = threading.Thread(target=refresh_problem_page, args=(day,))
+                refresh_thread.daemon = True
+                refresh_thread.start()
+            return page.decode()
+    
+    base_url = puzzle_url(YEAR, day)
     cookies = {'session': SESSION_ID}
     
     print(f"Fetching from {base_url}")
     response = fetch_with_retry(base_url, cookies)
     if not response:
+        return None
+    STORE.put(YEAR, day, 'page', response.content)
+    return response.text
+
+def refresh_problem_page(day):
+    """Refetches a stored problem page (a cheap 304 if unchanged) and shows part 2 if it appeared."""
+    page = fetch_problem_page(day)
+    if page and page.count('<article class="day-desc"') > 1:
+        update_problem_text(day, page)
+
+@METRICS.timed()
+def update_problem_text(day, page=None):
+    """Fetches problem description and updates global problem_data.
+    
+    The page is parsed once; the viewer, the test case extractor and the
+    template generator all work on the same tree. Pass already fetched
+    `page` HTML to skip the request. Returns (success, part 1 article).
+    """
+    import html_parser
+    import problem_viewer
+
+    page = page or fetch_problem_page(day)
+    if not page:
         return False, None
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    with METRICS.span('parse_html'):
+        soup = html_parser.parse(page)
     articles = soup.find_all('article', class_='day-desc')
     
     if articles:
-        problem_data['day'] = day
-        problem_data['part1'] = problem_text_processor.transform_problem_text(str(articles[0]), part=1)
+        problem_data = problem_viewer.problem_data
+        with problem_viewer.problem_data_changed:
+            if (problem_data['year'], problem_data['day']) != (YEAR, day):
+                problem_data['part2'] = None  # Switched days, drop the previous day's part 2
+            problem_data['year'] = YEAR
+            problem_data['day'] = day
+            for part, article in enumerate(articles[:2], 1):
+                # Unchanged articles come from the processor's cache; slow stages upgrade the text later
+                problem_data[f'part{part}'] = problem_text_processor.transform_problem_text_async(
+                    str(article), part, functools.partial(upgrade_problem_text, YEAR, day, part))
+            problem_viewer.publish_problem_data()
         if len(articles) > 1:
-            problem_data['part2'] = problem_text_processor.transform_problem_text(str(articles[1]), part=2)
             print("Part 2 is available!")
-            create_solution_template(day, 2, str(articles[1]))
-        return True, str(articles[0])
+            create_solution_template(day, 2, articles[1])
+        return True, articles[0]
     else:
         print("Could not find problem description")
         return False, None
 
+def upgrade_problem_text(year, day, part, html):
+    """Shows the fully transformed text of a part once slow processing stages are done."""
+    import problem_viewer
+    
+    with problem_viewer.problem_data_changed:
+        problem_data = problem_viewer.problem_data
+        if (problem_data['year'], problem_data['day']) == (year, day):
+            problem_data[f'part{part}'] = html
+            problem_viewer.publish_problem_data()
+
+def strip_file_end(path):
+    """Removes trailing whitespace from a file in place."""
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 64))
+        tail = f.read()
+        f.truncate(size - (len(tail) - len(tail.rstrip())))
+
 def fetch_input(day, force=False):
-    """Downloads input file for given day if not already cached."""
-    if os.path.exists('input.txt') and not force:
-        print("Input already exists, skipping...")
+    """Writes the input for given day to input.txt.
+    
+    The input comes from the content store when it has it; otherwise it is
+    streamed into input.txt as it downloads and saved to the store.
+    """
+    data = None if force else STORE.get(YEAR, day, 'input')
+    if data is not None:
+        print("Input loaded from the content store")
+        content_store.write_atomic('input.txt', [data.rstrip()])
         return True
 
-    input_url = f"https://adventofcode.com/2024/day/{day}/input"
+    input_url = f"{puzzle_url(YEAR, day)}/input"
     cookies = {'session': SESSION_ID}
     
     print(f"Fetching from {input_url}")
-    response = fetch_with_retry(input_url, cookies)
+    response = fetch_with_retry(input_url, cookies, dest='input.txt')
     if not response:
         return False
 
-    with open('input.txt', 'w') as f:
-        f.write(response.text.strip())
+    STORE.put(YEAR, day, 'input', response.content)
+    strip_file_end('input.txt')
     return True
 
+@METRICS.timed()
 def create_solution_template(day, part, problem_text):
-    """Create solution template with test case and expected result."""
-    test_case, expected_result = test_case_extractor.extract_test_case(problem_text)
-    template = test_case_extractor.create_solution_template(day, part, test_case, expected_result)
+    """Create solution template with test case and expected result.
+    
+    `problem_text` may be the article HTML or its already parsed tree.
+    """
+    import test_case_extractor
+
+    with METRICS.span('extract_test_case', part=part):
+        examples = test_case_extractor.extract_examples(problem_text)
+    (test_case, expected_result), more_examples = examples[0], examples[1:]
+    template = test_case_extractor.create_solution_template(day, part, test_case, expected_result,
+                                                            year=YEAR, examples=more_examples)
     
     filename = f'solution{part}_day{day}.py'
     with open(filename, 'w') as f:
         f.write(template)
     print(f"Created {filename}")
 
-def monitor_solutions(day):
-    """Monitors and submits solutions as they become available."""
-    part1_submitted = False
-    part2_submitted = False
+SOLUTION_FILES = {'solution1.txt': 1, 'solution2.txt': 2}
+DAY_FILE = '.aoc_day'  # Year/day the answer files in the working directory belong to
+ARCHIVE_DIR = 'archive'
+
+def claim_working_dir(day):
+    """Marks the working directory as `day`'s, moving another day's answer files to ARCHIVE_DIR.
     
-    while not (part1_submitted and part2_submitted):
-        try:
-            # Check for part 1 solution
-            if not part1_submitted and os.path.exists('solution1.txt'):
-                with open('solution1.txt', 'r') as f:
-                    answer = f.read().strip()
-                success, message = submit_answer(day, 1, answer)
-                print(f"Part 1 submission result: {message}")
-                if success:
-                    part1_submitted = True
-                    # Update problem text to get part 2
-                    update_problem_text(day)
-                elif "wait" in message.lower():
-                    wait_match = re.search(r'wait (\d+)s', message) or re.search(r'have (\d+)s left to wait', message)
-                    if wait_match:
-                        wait_time = int(wait_match.group(1))
-                        if os.path.exists('solution1.txt'):
-                            os.remove('solution1.txt')
-                            print(f"Deleted solution1.txt - will retry in {wait_time} seconds")
-                        time.sleep(wait_time + 1)  # Add 1 second buffer
-            
-            # Check for part 2 solution
-            if part1_submitted and not part2_submitted and os.path.exists('solution2.txt'):
-                with open('solution2.txt', 'r') as f:
+    solution1.txt/solution2.txt are shared by every day, so leftovers from
+    the previous day would otherwise be submitted for this one.
+    """
+    current = f"{YEAR}/{day}"
+    try:
+        with open(DAY_FILE, 'r') as f:
+            previous = f.read().strip()
+    except OSError:
+        previous = None
+    if previous == current:
+        return
+    leftovers = [name for name in SOLUTION_FILES if os.path.exists(name)]
+    if leftovers:
+        archive = os.path.join(ARCHIVE_DIR, (previous or 'unknown').replace('/', '-'))
+        os.makedirs(archive, exist_ok=True)
+        for name in leftovers:
+            os.replace(name, os.path.join(archive, name))
+        print(f"Moved {', '.join(leftovers)} of {previous or 'an earlier day'} to {archive}")
+    content_store.write_atomic(DAY_FILE, [current], 'w')
+
+def feed_solution_files(day, watcher, scheduler):
+    """Queues every completely written solution file for submission."""
+    while not scheduler.closed:
+        for name in watcher.wait():
+            try:
+                with open(name, 'r') as f:
                     answer = f.read().strip()
-                success, message = submit_answer(day, 2, answer)
-                print(f"Part 2 submission result: {message}")
-                if success:
-                    part2_submitted = True
-                elif "wait" in message.lower():
-                    wait_match = re.search(r'wait (\d+)s', message) or re.search(r'have (\d+)s left to wait', message)
-                    if wait_match:
-                        wait_time = int(wait_match.group(1))
-                        if os.path.exists('solution2.txt'):
-                            os.remove('solution2.txt')
-                            print(f"Deleted solution2.txt - will retry in {wait_time} seconds")
-                        time.sleep(wait_time + 1)  # Add 1 second buffer
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Could not read {name}: {e}")
+                continue
+            if answer:
+                scheduler.schedule(day, SOLUTION_FILES[name], answer)
+
+@METRICS.timed()
+def monitor_solutions(day, scheduler=None):
+    """Monitors and submits solutions as they become available.
+    
+    Pass a scheduler to queue answers from elsewhere; closing it stops the monitor.
+    """
+    import solution_watcher
+
+    scheduler = scheduler or submission_scheduler.SubmissionScheduler()
+    watcher = solution_watcher.create_watcher(list(SOLUTION_FILES))
+    feeder = threading.Thread(target=feed_solution_files, args=(day, watcher, scheduler))
+    feeder.daemon = True
+    feeder.start()
+    
+    submitted = set()
+    held_part2 = None
+    try:
+        while len(submitted) < 2:
+            # Block until the earliest queued answer may be submitted
+            due = scheduler.next_due()
+            if due is None:
+                break
+            _, part, answer = due
+            if part in submitted:
+                continue
+            if part == 2 and 1 not in submitted:
+                held_part2 = answer  # Submitted once part 1 is accepted
+                continue
             
-            time.sleep(1)  # Check every second
+            try:
+                success, message = submit_answer(day, part, answer)
+            except Exception as e:
+                print(f"Error in monitor_solutions: {e}")
+                scheduler.defer(day, part, answer, 1)  # Retry shortly
+                continue
             
-        except Exception as e:
-            print(f"Error in monitor_solutions: {e}")
-            time.sleep(1)  # Wait a bit on error
+            print(f"Part {part} submission result: {message}")
+            if success:
+                submitted.add(part)
+                if part == 1:
+                    # Update problem text to get part 2
+                    update_problem_text(day)
+                    if held_part2 is not None:
+                        scheduler.schedule(day, 2, held_part2)
+                        held_part2 = None
+            else:
+                wait_time = handle_wait_time(message)
+                if wait_time is not None:
+                    print(f"Part {part} answer queued - will retry in {wait_time} seconds")
+                    scheduler.defer(day, part, answer, wait_time + 1)  # Add 1 second buffer
+    finally:
+        scheduler.close()
+        watcher.wake()
+        feeder.join()
+        watcher.close()  # Only once the feeder is done with it
 
-def fetch_aoc_content(day, force=False):
-    """Sets up problem environment and starts solution monitoring."""
-    print("Creating HTML template...")
-    create_html_template(day)
+def report_run(part, result):
+    """Prints the outcome of a warm solution run."""
+    status = result['status']
+    if status == 'ok':
+        print(f"[PASS] Part {part}: test gave {result['test_result']}, "
+              f"answer {result['answer']} ({result['elapsed'] * 1000:.1f} ms)")
+    elif status == 'failed':
+        print(f"[FAIL] Part {part} test case failed! Expected {result['expected_result']}, "
+              f"got {result['test_result']}")
+    elif status == 'no_result':
+        print(f"Part {part}: solve() returned no result")
+    else:
+        print(f"Part {part} run {status}:\n{result.get('error', '')}")
+
+RUN_TIMEOUT = 60  # Seconds a warm solution run may take before its worker is replaced
+
+def run_solutions_on_save(day, runner, scheduler):
+    """Runs saved solution files in the warm runner and queues their answers for submission."""
+    import solution_watcher
+
+    solution_files = {f'solution{part}_day{day}.py': part for part in (1, 2)}
+    watcher = solution_watcher.create_watcher(list(solution_files))
+    while not scheduler.closed:
+        for name in watcher.wait(timeout=1):
+            part = solution_files[name]
+            with METRICS.span('run_solution', part=part):
+                result = runner.run(name, RUN_TIMEOUT)
+            report_run(part, result)
+            if result['status'] == 'ok':
+                scheduler.schedule(day, part, result['answer'])
+    watcher.close()
+
+async def fetch_day(day, force, timer):
+    """Fetches the problem text and the input concurrently, timing every stage.
     
-    print("Starting local server...")
-    server = start_server()
+    The part 1 template is written as soon as the problem page is in, without
+    waiting for the input. Returns True if both chains succeeded.
+    """
+    import asyncio
+
+    async def problem_chain():
+        page = await timer.run('problem', 'fetch page', fetch_problem_page, day, not force)
+        if not page:
+            return False
+        result, problem_text = await timer.run('problem', 'parse + publish', update_problem_text, day, page)
+        if not result:
+            return False
+        await timer.run('problem', 'template part 1', create_solution_template, day, 1, problem_text)
+        return True
     
-    print("Fetching problem text...")
-    result, problem_text = update_problem_text(day)
-    if not result:
-        return False
+    async def input_chain():
+        return await timer.run('input', 'download input', fetch_input, day, force)
     
-    print("Fetching input...")
-    if not fetch_input(day, force):
-        return False
+    return all(await asyncio.gather(problem_chain(), input_chain()))
+
+def prepare_day(day, force=False, unlocked_at=None, runner=None, timer=None):
+    """Fetches the problem text and input for given day and starts solution monitoring.
+    
+    The problem text and input are fetched at the same time. Pass the local
+    unlock time as `unlocked_at` to time the stages from the unlock, or your
+    own fetch_pipeline.StageTimer as `timer` to read the timings. With a
+    warm `runner`, saved solution files are run in it and their answers go
+    straight to the submission queue. Answer files left by another day are
+    archived first (see claim_working_dir). Returns the submission scheduler
+    (close it to stop monitoring), or None if fetching failed.
+    """
+    import asyncio
+    import fetch_pipeline
+    import problem_viewer
+
+    claim_working_dir(day)
+    
+    print("Creating HTML template...")
+    problem_viewer.create_html_template(day, YEAR)
     
-    print("Creating solution template...")
-    create_solution_template(day, 1, problem_text)
+    METRICS.set_timeline(os.path.join(TIMELINE_DIR, f"{YEAR}-{day:02d}.jsonl"))
+    
+    print("Fetching problem text and input...")
+    timer = timer or fetch_pipeline.StageTimer(unlocked_at)
+    result = asyncio.run(fetch_day(day, force, timer))
+    print(f"Stage timings (from {'unlock' if unlocked_at is not None else 'start'}):")
+    print(timer.report())
+    if not result:
+        return None
     
     print("Starting solution monitor...")
-    monitor_thread = threading.Thread(target=monitor_solutions, args=(day,))
+    scheduler = submission_scheduler.SubmissionScheduler()
+    monitor_thread = threading.Thread(target=monitor_solutions, args=(day, scheduler))
     monitor_thread.daemon = True
     monitor_thread.start()
     
-    return True
+    if runner is not None:
+        runner_thread = threading.Thread(target=run_solutions_on_save, args=(day, runner, scheduler))
+        runner_thread.daemon = True
+        runner_thread.start()
+    
+    return scheduler
+
+def fetch_aoc_content(day, force=False, unlocked_at=None, warm=False):
+    """Sets up problem environment and starts solution monitoring.
+    
+    Starts the local viewer server and, with `warm`, a warm worker process
+    for saved solution files, then prepares the day (see prepare_day).
+    """
+    import problem_viewer
+    import solution_runner
+
+    print("Starting local server...")
+    server = problem_viewer.start_server(metrics=METRICS, extra_counters=metrics_counters)
+    
+    runner = None
+    if warm:
+        print("Starting warm solution runner...")
+        runner = solution_runner.WarmRunner()
+    
+    return prepare_day(day, force, unlocked_at, runner) is not None
+
+# Resident daemon: `python main.py daemon` keeps the HTTP session, viewer server,
+# parser and warm runner alive, and `python main.py switch <day>` tells it to prepare a day
+DAEMON_ADDRESS = ('localhost', 8001)
+DAEMON_KEY_FILE = os.path.join(CACHE_DIR, 'daemon.key')
+
+def daemon_authkey():
+    """Returns the key daemon clients authenticate with, creating it (readable only by you) on first use."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        fd = os.open(DAEMON_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(DAEMON_KEY_FILE, 'rb') as f:
+            return f.read()
+    key = os.urandom(32)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+def send_to_daemon(request):
+    """Sends a request to the running daemon and returns its reply, or None if no daemon is running."""
+    from multiprocessing.connection import Client
+    try:
+        with Client(DAEMON_ADDRESS, authkey=daemon_authkey()) as conn:
+            conn.send(request)
+            return conn.recv()
+    except ConnectionRefusedError:
+        return None
+
+def switch_day(active, runner, request):
+    """Stops monitoring the current day and prepares the requested one; returns a status message."""
+    global YEAR
+    with active['lock']:
+        if active['scheduler'] is not None:
+            active['scheduler'].close()
+            active['scheduler'] = None
+        YEAR = request['year']
+        day = request['day']
+        started = time.time()
+        unlocked_at = wait_for_day(day)
+        scheduler = prepare_day(day, request['force'], unlocked_at, runner)
+        if scheduler is None:
+            return f"Failed to prepare {YEAR} day {day}"
+        active['scheduler'] = scheduler
+        return f"{YEAR} day {day} ready in {time.time() - started:.2f}s"
+
+def serve_switch(conn, active, runner, request):
+    """Handles one switch request and replies on `conn`."""
+    with conn:
+        try:
+            reply = switch_day(active, runner, request)
+        except Exception as e:
+            reply = f"Error: {e}"
+        try:
+            conn.send(reply)
+        except OSError:
+            pass  # Client went away
+
+def run_daemon(warm=False):
+    """Runs the resident daemon until `python main.py daemon --stop`."""
+    from multiprocessing.connection import Listener, AuthenticationError
+    import problem_viewer
+    import solution_runner
+    # Imported up front so the first switch does not pay for them
+    import asyncio
+    import fetch_pipeline
+    import html_parser
+    import requests
+    import solution_watcher
+    import test_case_extractor
+
+    problem_viewer.start_server(metrics=METRICS, extra_counters=metrics_counters)
+    runner = solution_runner.WarmRunner() if warm else None
+    http_session().prewarm(f"{BASE_URL}/")
+    active = {'lock': threading.Lock(), 'scheduler': None}
+    
+    with Listener(DAEMON_ADDRESS, authkey=daemon_authkey()) as listener:
+        print(f"Daemon listening on {DAEMON_ADDRESS[0]}:{DAEMON_ADDRESS[1]}, "
+              f"viewer at http://localhost:8000")
+        print("Switch days with `python main.py switch <day>`")
+        while True:
+            try:
+                conn = listener.accept()
+                request = conn.recv()
+            except (AuthenticationError, EOFError, OSError) as e:
+                print(f"Rejected daemon client: {e}")
+                continue
+            if request.get('command') == 'stop':
+                conn.send("Daemon stopped")
+                conn.close()
+                break
+            handler = threading.Thread(target=serve_switch, args=(conn, active, runner, request))
+            handler.daemon = True
+            handler.start()
+    
+    if active['scheduler'] is not None:
+        active['scheduler'].close()
+    if runner is not None:
+        runner.close()
+
+def parse_range(text):
+    """Parses a list of numbers and ranges like '2015-2017,2024' into a list of ints."""
+    numbers = []
+    for part in text.split(','):
+        first, _, last = part.partition('-')
+        numbers.extend(range(int(first), int(last or first) + 1))
+    return numbers
+
+def prefetch(years, days):
+    """Fetches every missing problem page and input for `years` x `days` into the content store.
+    
+    Requests go out one by one through the rate limiter. Days that are not
+    unlocked yet are skipped, and items already in the store are not fetched
+    again, so an interrupted prefetch resumes where it stopped.
+    """
+    now = SERVER_CLOCK.now()
+    missing = [(year, day, kind)
+               for year in years for day in days
+               if unlock_scheduler.unlock_time(year, day).timestamp() <= now
+               for kind in ('page', 'input')
+               if not STORE.has(year, day, kind)]
+    print(f"{len(missing)} items to fetch "
+          f"(about {len(missing) * MIN_REQUEST_INTERVAL / 60:.0f} minutes at the request budget)")
+    
+    cookies = {'session': SESSION_ID}
+    fetched = 0
+    for i, (year, day, kind) in enumerate(missing):
+        url = puzzle_url(year, day) + ('/input' if kind == 'input' else '')
+        print(f"[{i + 1}/{len(missing)}] Fetching from {url}")
+        response = fetch_with_retry(url, cookies)
+        if not response:
+            print(f"Skipping {year} day {day} {kind}")
+            continue
+        STORE.put(year, day, kind, response.content)
+        fetched += 1
+    print(f"Fetched {fetched} of {len(missing)} items")
+    return fetched
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python prep_script.py <day> [--force]")
+        print("Usage: python prep_script.py <day> [--force] [--warm] [--year <year>]")
+        print("       python prep_script.py prefetch <years> [days]  (e.g. prefetch 2015-2023 1-25)")
+        print("       python prep_script.py ledger [day]")
+        print("       python prep_script.py daemon [--warm] | daemon --stop")
+        print("       python prep_script.py switch <day> [--force] [--year <year>]")
         sys.exit(1)
     
+    if "--year" in sys.argv:
+        YEAR = int(sys.argv[sys.argv.index("--year") + 1])
+    
+    if sys.argv[1] == "prefetch":
+        try:
+            prefetch(parse_range(sys.argv[2]), parse_range(sys.argv[3]) if len(sys.argv) > 3 else range(1, 26))
+        except KeyboardInterrupt:
+            print("\nInterrupted - run again to resume")
+        sys.exit(0)
+    
+    if sys.argv[1] == "ledger":
+        ledger_day = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(LEDGER.format(YEAR, ledger_day))
+        sys.exit(0)
+    
+    if sys.argv[1] == "daemon":
+        if "--stop" in sys.argv:
+            print(send_to_daemon({'command': 'stop'}) or "No daemon running")
+        else:
+            try:
+                run_daemon("--warm" in sys.argv)
+            except KeyboardInterrupt:
+                print("\nShutting down...")
+        sys.exit(0)
+    
+    switch = sys.argv[1] == "switch"
     try:
-        day = int(sys.argv[1])
+        day = int(sys.argv[2 if switch else 1])
         if day < 1 or day > 25:
             print("Day must be between 1 and 25")
             sys.exit(1)
-    except ValueError:
+    except (ValueError, IndexError):
         print("Day must be a number")
         sys.exit(1)
     
     force = "--force" in sys.argv
+    warm = "--warm" in sys.argv
+    
+    if switch:
+        reply = send_to_daemon({'command': 'switch', 'day': day, 'year': YEAR, 'force': force})
+        print(reply or "No daemon running, start one with `python main.py daemon`")
+        sys.exit(0 if reply else 1)
     
-    # Check next puzzle time
-    next_puzzle = get_next_puzzle_time()
-    if next_puzzle:
-        now = datetime.now(pytz.timezone('US/Eastern'))
-        wait_time = (next_puzzle - now).total_seconds() - 1  # minus 1 second
-        if wait_time > 0:
-            print(f"Waiting {wait_time:.0f} seconds for next puzzle...")
-            time.sleep(wait_time)
+    # Wait for the puzzle to unlock if it is not out yet
+    unlocked_at = wait_for_day(day)
     
     print(f"Fetching content for day {day}...")
-    if fetch_aoc_content(day, force):
+    if fetch_aoc_content(day, force, unlocked_at, warm):
         print("Successfully fetched content!")
+        print(f"Response cache: {http_session().stats}")
         print("\nLocal server running at http://localhost:8000")
         print("\nMonitoring for solutions in solution1.txt and solution2.txt")
         print("Press Ctrl+C to stop")
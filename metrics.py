@@ -0,0 +1,93 @@
+"""Module for lightweight timing spans, counters and a per-day timeline."""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Thread-safe collection of counters and timing spans.
+
+    Every finished span is summarised per name (count, total, max) and, once
+    a timeline file is set, appended to it as one JSON line.
+    """
+    def __init__(self, prefix='aoc'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.spans = {}  # name -> [count, total seconds, max seconds]
+        self.timeline_path = None
+
+    def set_timeline(self, path):
+        """Appends every finished span to `path` (JSON lines) from now on."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.timeline_path = path
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name, started_at, elapsed, **attrs):
+        """Adds a finished span that started at `started_at` (wall clock) and took `elapsed` seconds."""
+        with self._lock:
+            summary = self.spans.setdefault(name, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += elapsed
+            summary[2] = max(summary[2], elapsed)
+            if self.timeline_path:
+                event = {'span': name, 'at': round(started_at, 6), 'seconds': round(elapsed, 6),
+                         'thread': threading.current_thread().name, **attrs}
+                with open(self.timeline_path, 'a') as f:
+                    f.write(json.dumps(event) + '\n')
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Times the enclosed block as span `name`; `attrs` go into the timeline entry."""
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at, time.perf_counter() - start, **attrs)
+
+    def timed(self, name=None):
+        """Decorator that times every call of a function as a span."""
+        def decorate(func):
+            span_name = name or func.__name__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def snapshot(self, extra_counters=None):
+        """Returns {'counters': {...}, 'spans': {name: {'count', 'total', 'max'}}}."""
+        with self._lock:
+            counters = dict(self.counters)
+            spans = {name: {'count': count, 'total': total, 'max': longest}
+                     for name, (count, total, longest) in self.spans.items()}
+        counters.update(extra_counters or {})
+        return {'counters': counters, 'spans': spans}
+
+    def prometheus(self, extra_counters=None):
+        """Returns the snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot(extra_counters)
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        spans = sorted(snapshot['spans'].items())
+        metric = f"{self.prefix}_span_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for name, summary in spans:
+            lines.append(f'{metric}_count{{span="{name}"}} {summary["count"]}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {summary["total"]:.6f}')
+        metric = f"{self.prefix}_span_max_seconds"
+        lines.append(f"# TYPE {metric} gauge")
+        for name, summary in spans:
+            lines.append(f'{metric}{{span="{name}"}} {summary["max"]:.6f}')
+        return '\n'.join(lines) + '\n'
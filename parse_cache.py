@@ -0,0 +1,159 @@
+"""Module for caching parsed puzzle input across solution runs."""
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+
+import input_loaders
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'aoc_helper', 'parsed')
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Least recently used entries are evicted above this size
+
+
+def _code_names(code):
+    """Yields the global names used by a code object and the functions nested in it."""
+    yield from code.co_names
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            yield from _code_names(const)
+
+
+def _file_source(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except (OSError, TypeError):
+        return b''
+
+
+def _function_source(func):
+    try:
+        return inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = func.__code__
+        return code.co_code + repr(code.co_consts).encode()
+
+
+def _value_repr(value):
+    """Returns a stable representation of a module-level constant."""
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(repr(item) for item in value))  # Set order changes between runs
+    text = repr(value)
+    return type(value).__name__ if ' at 0x' in text else text  # Default reprs hold an address
+
+
+def source_hash(func):
+    """Returns a hash of the code a parse function depends on.
+
+    Covers the function's source and, followed through the global names it
+    uses, the functions, classes and constants it references from its own
+    file (so editing solve() does not change the hash), plus the whole file
+    of every other module it uses helpers from (e.g. input_loaders).
+    """
+    root_file = func.__code__.co_filename
+    digest = hashlib.sha256()
+    files = set()
+    seen = set()
+
+    def visit(func):
+        if func in seen:
+            return
+        seen.add(func)
+        digest.update(_function_source(func))
+        for name in sorted(set(_code_names(func.__code__))):
+            if name not in func.__globals__:
+                continue  # Builtin or attribute name
+            value = func.__globals__[name]
+            if inspect.ismodule(value):
+                files.add(getattr(value, '__file__', None))
+            elif inspect.isfunction(value):
+                if value.__code__.co_filename == root_file:
+                    visit(value)
+                else:
+                    files.add(value.__code__.co_filename)
+            elif inspect.isclass(value):
+                if value.__module__ == func.__module__:
+                    digest.update(name.encode())
+                    for attr in vars(value).values():
+                        if inspect.isfunction(attr):
+                            visit(attr)
+                else:
+                    files.add(getattr(sys.modules.get(value.__module__), '__file__', None))
+            elif not callable(value):
+                digest.update(f"{name}={_value_repr(value)}".encode())
+
+    visit(func)
+    for path in sorted(filter(None, files)):
+        digest.update(_file_source(path))
+    return digest.hexdigest()[:16]
+
+
+def decode_input(raw):
+    """Decodes input bytes the way reading the file in text mode would."""
+    return bytes(raw).decode().replace('\r\n', '\n').replace('\r', '\n')
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Deletes least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith('.pickle'):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def load_parsed(parse_input, path='input.txt', raw=None, binary=False,
+                cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Returns parse_input(<contents of path>), reusing a cached result when possible.
+
+    Entries are keyed by a hash of the input bytes plus a hash of parse_input's
+    source and everything it references (see source_hash), so editing either
+    one automatically misses the cache. Results are stored pickled; results
+    that cannot be pickled are simply not cached.
+    Pass `raw` to use input bytes that were already read. With `binary`,
+    parse_input gets the memory-mapped bytes instead of decoded text.
+    """
+    if raw is None:
+        raw = input_loaders.map_input(path)
+    key = f"{hashlib.sha256(raw).hexdigest()[:32]}-{source_hash(parse_input)}"
+    entry = os.path.join(cache_dir, key + '.pickle')
+
+    try:
+        with open(entry, 'rb') as f:
+            data = pickle.load(f)
+        os.utime(entry)  # Mark as recently used
+        return data
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    data = parse_input(raw if binary else decode_input(raw))
+    tmp_path = f"{entry}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry)
+        evict(cache_dir, max_bytes)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # Not picklable (e.g. a generator); just don't cache it
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return data
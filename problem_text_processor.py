@@ -1,24 +1,126 @@
-"""Module for processing and transforming problem text before display."""
+"""Module for processing and transforming problem text before display.
+
+Transforms are pipeline stages registered with register_stage(). Results are
+cached by article content hash and stage versions, so an article whose HTML
+did not change (e.g. part 1 on the refetch after a correct answer) is never
+processed twice. Stages marked slow run in a background thread: the viewer
+gets the output of the fast stages at once and is upgraded when the slow
+stages are done.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Pipeline stages in order: (name, version, function(html, part) -> html, slow).
+# Bump a stage's version whenever its output changes so cached results are recomputed.
+# None are registered yet, so problem text is shown unchanged. Ideas: a summary at
+# the top, highlighting key information, extracting and formatting constraints.
+STAGES = []
+
+MAX_CACHE_ENTRIES = 256  # Stage outputs kept, least recently used evicted first
+
+_cache = OrderedDict()  # (content hash, part, stage signature) -> html
+_cache_lock = threading.Lock()
+_pending = {}  # Cache key of a running slow job -> callbacks waiting for it
+
+def register_stage(name, func, version=1, slow=False):
+    """Adds a transform stage, replacing any stage of the same name.
+
+    `func(html, part)` returns the transformed HTML. Pass `slow=True` for
+    stages that should not hold up the viewer (e.g. summaries).
+    """
+    STAGES[:] = [stage for stage in STAGES if stage[0] != name]
+    STAGES.append((name, version, func, slow))
+
+def _cache_get(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+        return None
+
+def _cache_put(key, html):
+    with _cache_lock:
+        _cache[key] = html
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+def _run_stages(html_content, part, stages):
+    """Runs `stages` on the article, reusing the cached output of every stage prefix."""
+    digest = hashlib.sha256(html_content.encode()).hexdigest()
+    html = html_content
+    signature = ()
+    for name, version, func, _ in stages:
+        signature += ((name, version),)
+        key = (digest, part, signature)
+        cached = _cache_get(key)
+        if cached is None:
+            cached = func(html, part)
+            _cache_put(key, cached)
+        html = cached
+    return html
+
+def _split_stages():
+    """Returns (fast stages before the first slow one, all stages)."""
+    stages = list(STAGES)
+    for i, stage in enumerate(stages):
+        if stage[3]:
+            return stages[:i], stages
+    return stages, stages
 
 def transform_problem_text(html_content, part=1):
     """Transform problem text before displaying in the web interface.
-    
+
     Args:
         html_content (str): The original HTML content of the problem
         part (int): Problem part number (1 or 2)
-    
+
     Returns:
-        str: Transformed HTML content
-        
-    Note:
-        This is a placeholder for future NLP enhancements. Currently passes through
-        the original content unchanged. Future versions could:
-        - Add summary at the top
-        - Highlight key information
-        - Extract and format constraints
-        - Add section headers
-        - etc.
+        str: Transformed HTML content, after all stages including slow ones
+    """
+    return _run_stages(html_content, part, list(STAGES))
+
+def transform_problem_text_async(html_content, part=1, on_ready=None):
+    """Returns the text to show right away and finishes slow stages in the background.
+
+    The immediate result has every stage up to the first slow one applied.
+    When slow stages remain, `on_ready(html)` is called from a background
+    thread with the fully transformed text. Concurrent requests for the same
+    article share one background job.
     """
-    # TODO: Add NLP processing here
-    # For now, just pass through unchanged
-    return html_content
+    fast, stages = _split_stages()
+    html = _run_stages(html_content, part, fast)
+    if len(fast) == len(stages):
+        return html
+
+    key = (hashlib.sha256(html_content.encode()).hexdigest(), part,
+           tuple((name, version) for name, version, _, _ in stages))
+    done = _cache_get(key)
+    if done is not None:
+        return done
+
+    with _cache_lock:
+        callbacks = _pending.get(key)
+        if callbacks is not None:
+            if on_ready:
+                callbacks.append(on_ready)
+            return html
+        _pending[key] = [on_ready] if on_ready else []
+
+    def finish():
+        try:
+            result = _run_stages(html_content, part, stages)
+        except Exception as e:
+            print(f"Problem text transform failed: {e}")
+            result = None
+        with _cache_lock:
+            callbacks = _pending.pop(key, [])
+        if result is not None:
+            for callback in callbacks:
+                callback(result)
+
+    worker = threading.Thread(target=finish)
+    worker.daemon = True
+    worker.start()
+    return html
@@ -0,0 +1,231 @@
+"""Module for the local problem viewer: an HTTP server that pushes problem text updates to the page."""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# Problem text shown by the viewer
+problem_data = {
+    "part1": None,
+    "part2": None,
+    "day": None,
+    "year": None
+}
+
+# Viewers are pushed a new version of problem_data whenever it changes
+SSE_KEEPALIVE_INTERVAL = 15  # Seconds between keep-alive comments on idle event streams
+problem_version = 0
+problem_payload = json.dumps({"version": 0, **problem_data})
+problem_data_changed = threading.Condition()
+
+def publish_problem_data():
+    """Serializes problem_data once under a new version and wakes up all waiting viewers."""
+    global problem_version, problem_payload
+    with problem_data_changed:
+        problem_version += 1
+        problem_payload = json.dumps({"version": problem_version, **problem_data})
+        problem_data_changed.notify_all()
+
+# Pre-rendered viewer responses: path -> (source key, ETag, body, gzipped body)
+rendered_responses = {}
+rendered_responses_lock = threading.Lock()
+
+def render_response(path, key, build):
+    """Returns the cached rendering of `path`, rebuilding it only when `key` changed."""
+    with rendered_responses_lock:
+        cached = rendered_responses.get(path)
+        if cached is None or cached[0] != key:
+            body = build()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cached = (key, etag, body, gzip.compress(body))
+            rendered_responses[path] = cached
+        return cached
+
+class ProblemHandler(SimpleHTTPRequestHandler):
+    """Handles HTTP requests for the local problem viewer."""
+    def do_GET(self):
+        if self.path == '/':
+            stat = os.stat('problem.html')
+            def read_template():
+                with open('problem.html', 'rb') as f:
+                    return f.read()
+            self.send_rendered('text/html; charset=utf-8',
+                               render_response('/', (stat.st_mtime_ns, stat.st_size), read_template))
+        
+        elif self.path == '/problem-data':
+            with problem_data_changed:
+                version, payload = problem_version, problem_payload
+            self.send_rendered('application/json',
+                               render_response('/problem-data', version, payload.encode))
+        
+        elif self.path == '/events':
+            self.send_event_stream()
+        
+        elif urlsplit(self.path).path == '/metrics' and self.server.metrics is not None:
+            self.send_metrics()
+        
+        else:
+            super().do_GET()
+    
+    def send_metrics(self):
+        """Sends the metrics in Prometheus text format, or as JSON with ?format=json."""
+        if parse_qs(urlsplit(self.path).query).get('format') == ['json']:
+            content_type = 'application/json'
+            body = json.dumps(self.server.metrics.snapshot(self.server.extra_counters()), indent=1).encode()
+        else:
+            content_type = 'text/plain; version=0.0.4'
+            body = self.server.metrics.prometheus(self.server.extra_counters()).encode()
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_rendered(self, content_type, rendered):
+        """Sends a pre-rendered response, or 304 Not Modified if the client's copy is current."""
+        _, etag, body, gzipped = rendered
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            body = gzipped
+            etag = etag[:-1] + '-gzip"'  # Strong ETags differ per encoding
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')  # Always revalidate, cheap thanks to the ETag
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_event_stream(self):
+        """Streams problem_data as Server-Sent Events, one event per new version."""
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        try:
+            sent_version = int(self.headers.get('Last-Event-ID', -1))
+        except ValueError:
+            sent_version = -1
+        try:
+            while True:
+                with problem_data_changed:
+                    problem_data_changed.wait_for(lambda: problem_version != sent_version,
+                                                  timeout=SSE_KEEPALIVE_INTERVAL)
+                    version, payload = problem_version, problem_payload
+                if version != sent_version:
+                    self.wfile.write(f"id: {version}\ndata: {payload}\n\n".encode())
+                    sent_version = version
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Viewer closed the page
+    
+    def log_message(self, format, *args):
+        # Suppress logging
+        pass
+
+def start_server(port=8000, metrics=None, extra_counters=None):
+    """Starts local HTTP server for problem viewing.
+    
+    With a metrics.Metrics instance, /metrics serves it together with the
+    counters returned by `extra_counters()`.
+    """
+    server = ThreadingHTTPServer(('localhost', port), ProblemHandler)
+    server.metrics = metrics
+    server.extra_counters = extra_counters or dict
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    return server
+
+def create_html_template(day, year):
+    """Creates HTML template for problem viewing."""
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Advent of Code {year} - Day {day}</title>
+    <style>
+        body {{
+            font-family: 'Source Code Pro', monospace;
+            background-color: #0f0f23;
+            color: #cccccc;
+            max-width: 900px;
+            margin: 0 auto;
+            padding: 1em;
+        }}
+        h1, h2 {{
+            color: #00cc00;
+            text-shadow: 0 0 2px #00cc00, 0 0 5px #00cc00;
+        }}
+        .problem-text {{
+            line-height: 1.5;
+            margin: 1em 0;
+        }}
+        pre {{
+            background-color: #10101a;
+            padding: 1em;
+            border-radius: 4px;
+            overflow-x: auto;
+        }}
+        code {{
+            color: #ffffff;
+        }}
+        #part2 {{
+            margin-top: 2em;
+            padding-top: 1em;
+            border-top: 1px solid #333340;
+        }}
+    </style>
+</head>
+<body>
+    <h1 id="title">Advent of Code {year} - Day {day}</h1>
+    <div id="part1" class="problem-text"></div>
+    <div id="part2" class="problem-text"></div>
+
+    <script>
+        function showProblemData(data) {{
+            if (data.day) {{
+                // A resident daemon may switch to another day under an open page
+                document.title = `Advent of Code ${{data.year}} - Day ${{data.day}}`;
+                document.getElementById('title').textContent = document.title;
+            }}
+            document.getElementById('part1').innerHTML = data.part1 || '';
+            document.getElementById('part2').innerHTML = data.part2 || '';
+        }}
+
+        function updateProblemText() {{
+            fetch('/problem-data')
+                .then(response => response.json())
+                .then(showProblemData);
+        }}
+
+        if (window.EventSource) {{
+            // The server pushes a new version whenever the problem text changes
+            const events = new EventSource('/events');
+            events.onmessage = event => showProblemData(JSON.parse(event.data));
+        }} else {{
+            // Update initially and every 5 seconds
+            updateProblemText();
+            setInterval(updateProblemText, 5000);
+        }}
+    </script>
+</body>
+</html>
+"""
+    with open('problem.html', 'w', encoding='utf-8') as f:
+        f.write(html)
@@ -0,0 +1,93 @@
+"""Module for rate limiting requests to adventofcode.com across threads and processes."""
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: state is still shared between threads, not processes
+    fcntl = None
+
+
+class RateLimiter:
+    """Lock-protected token bucket with a separate budget per request kind.
+
+    `budgets` maps a kind (e.g. 'get' or 'post') to (interval, burst): one
+    token is added every `interval` seconds, up to `burst` tokens. Callers
+    reserve a token before sleeping, so concurrent callers queue up behind
+    each other instead of all sleeping the full interval.
+
+    When `state_file` is given the buckets are stored there under an
+    exclusive file lock, so every process using the same file shares one
+    budget.
+    """
+    def __init__(self, budgets, state_file=None):
+        self.budgets = dict(budgets)
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._state = {}
+        if state_file:
+            os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+
+    def _open_state(self):
+        """Opens and locks the state file, returning (file, state)."""
+        f = open(self.state_file, 'a+')
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            state = json.loads(f.read() or '{}')
+        except ValueError:
+            state = {}  # Corrupt state only costs us one unthrottled slot
+        return f, state
+
+    def _save_state(self, f, state):
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(state))
+        f.flush()
+
+    def _refill(self, state, kind, now):
+        """Returns the token count for `kind` at time `now`."""
+        interval, burst = self.budgets[kind]
+        tokens, updated = state.get(kind, (burst, now))
+        return min(burst, tokens + max(0, now - updated) / interval)
+
+    def _update(self, kind, take):
+        """Refills the bucket for `kind`, optionally takes a token, and returns the wait in seconds."""
+        interval, _ = self.budgets[kind]
+        with self._lock:
+            f = None
+            state = self._state
+            if self.state_file:
+                f, state = self._open_state()
+            try:
+                now = time.time()
+                tokens = self._refill(state, kind, now)
+                if take:
+                    tokens -= 1
+                    wait = max(0, -tokens * interval)
+                    state[kind] = (tokens, now)
+                    if f:
+                        self._save_state(f, state)
+                else:
+                    wait = max(0, (1 - tokens) * interval)
+                return wait
+            finally:
+                if f:
+                    f.close()  # Also releases the lock
+
+    def time_until_available(self, kind='get'):
+        """Returns seconds until a request of `kind` could go out without waiting."""
+        return self._update(kind, take=False)
+
+    def acquire(self, kind='get'):
+        """Reserves a slot for a request of `kind`, sleeping until it opens.
+
+        Returns the number of seconds slept.
+        """
+        wait = self._update(kind, take=True)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
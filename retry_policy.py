@@ -0,0 +1,137 @@
+"""Module for deciding whether and when a failed request to adventofcode.com is retried."""
+import random
+import threading
+import time
+
+# Outcome classes
+OK = 'ok'
+NOT_UNLOCKED = 'not unlocked'  # 404: the puzzle (or its input) is not out yet
+RATE_LIMITED = 'rate limited'  # 429 Too Many Requests
+SERVER_ERROR = 'server error'  # 5xx, typically overload right at unlock
+NETWORK_ERROR = 'network error'  # Connection reset, timeout, ...
+FATAL = 'fatal'  # Other 4xx, e.g. 400 for an expired session cookie
+
+RETRYABLE = (NOT_UNLOCKED, RATE_LIMITED, SERVER_ERROR, NETWORK_ERROR)
+
+
+def classify(status_code):
+    """Maps an HTTP status code (None for a network error) to an outcome class."""
+    if status_code is None:
+        return NETWORK_ERROR
+    if 200 <= status_code < 300:
+        return OK
+    if status_code == 404:
+        return NOT_UNLOCKED
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code >= 500:
+        return SERVER_ERROR
+    return FATAL
+
+
+def parse_retry_after(value, now=None):
+    """Returns the delay in seconds requested by a Retry-After header, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class RetryPolicy:
+    """Computes the delay before the next attempt, or None to give up.
+
+    - Fatal errors are not retried.
+    - A Retry-After header is always honored.
+    - Server and network errors back off exponentially with jitter.
+    - A 404 right after unlock is polled on the tight `unlock_poll_delays`
+      schedule, and given up on once it is exhausted. Outside the unlock
+      window a 404 is final.
+    """
+    def __init__(self, base_delay=1.0, max_delay=60.0,
+                 unlock_poll_delays=(0.25, 0.5, 0.5, 1.0, 1.0, 2.0, 2.0, 4.0),
+                 unlock_window=60.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.unlock_poll_delays = tuple(unlock_poll_delays)
+        self.unlock_window = unlock_window
+
+    def backoff(self, attempt):
+        """Jittered exponential delay for the `attempt`-th consecutive failure (1-based)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def next_delay(self, outcome, attempt, retry_after=None, since_unlock=None):
+        """Returns seconds to wait before retrying, or None to give up.
+
+        `attempt` counts the failed attempts so far (1-based), `retry_after` is
+        the parsed Retry-After header and `since_unlock` the seconds since the
+        most recent puzzle unlock.
+        """
+        if outcome not in RETRYABLE:
+            return None
+        if outcome == NOT_UNLOCKED:
+            if since_unlock is None or since_unlock > self.unlock_window:
+                return None
+            if attempt > len(self.unlock_poll_delays):
+                return None
+            delay = self.unlock_poll_delays[attempt - 1]
+        else:
+            delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """Stops sending requests after `threshold` consecutive failures.
+
+    Once open, requests are held back for `cooldown` seconds; then a single
+    probe is let through (half-open). A successful probe closes the breaker,
+    a failed one reopens it with twice the cooldown, up to `max_cooldown`.
+    """
+    def __init__(self, threshold=5, cooldown=30.0, max_cooldown=300.0):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def time_until_probe(self):
+        """Returns seconds until a request may go out (0 when closed or half-open)."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self.opened_at = None
+
+    def record_failure(self):
+        """Counts a failure; returns True if this opened (or reopened) the breaker."""
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None:
+                # Failed half-open probe
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self.opened_at = time.monotonic()
+                return True
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
@@ -0,0 +1,237 @@
+"""Module for running solution files in a warm worker process."""
+import ast
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import parse_cache
+
+# Imported once when the worker starts, so solutions don't pay for them on every run
+PRELOAD_MODULES = [
+    'collections', 'itertools', 'functools', 'heapq', 'math', 're',
+    'operator', 'bisect', 'string', 'numpy', 'networkx', 'sympy',
+]
+
+
+RUN_MARKER = '# Run test case'  # Where generated templates start running the solution
+
+
+def _is_literal(node):
+    try:
+        ast.literal_eval(node)
+        return True
+    except ValueError:
+        return False
+
+
+def load_solution(source, filename):
+    """Executes the module-level code of a solution file up to its run block and returns its namespace.
+
+    Everything before the template's `# Run test case` marker runs (imports,
+    definitions, constants such as compiled regexes, setrecursionlimit); the
+    code from the marker on, which runs the solution and writes files, is
+    skipped. Files without the marker keep only imports, definitions and
+    literal assignments. `if __name__ == '__main__'` blocks never run.
+    """
+    tree = ast.parse(source, filename)
+    lines = source.splitlines()
+    marker = next((number for number, line in enumerate(lines, 1) if line.strip() == RUN_MARKER), None)
+    if marker is not None:
+        tree.body = [node for node in tree.body if node.lineno < marker]
+    else:
+        tree.body = [
+            node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            or (isinstance(node, ast.Assign) and _is_literal(node.value))
+        ]
+    namespace = {'__name__': 'aoc_solution', '__file__': filename}
+    exec(compile(tree, filename, 'exec'), namespace)
+    return namespace
+
+
+def _examples(namespace):
+    """Returns the solution's (example input, expected result) pairs."""
+    return namespace.get('EXAMPLES') or [(namespace.get('test_input', ''), namespace.get('expected_result'))]
+
+
+def run_solution(path, input_raw):
+    """Checks a solution against its test cases and, if they pass, solves the real input.
+
+    Returns a dict with 'status' ('ok', 'failed', 'no_result' or 'error'),
+    'answer', 'test_result' and 'elapsed' (seconds spent in solve/parse_input).
+    """
+    with open(path, 'r') as f:
+        namespace = load_solution(f.read(), path)
+    solve, parse_input = namespace['solve'], namespace['parse_input']
+
+    binary = namespace.get('BINARY_INPUT', False)
+    start = time.perf_counter()
+    result = {'answer': None}
+    for test_input, expected_result in _examples(namespace):
+        test_result = solve(parse_input(test_input.encode() if binary else test_input))
+        result.setdefault('test_result', test_result)
+        result.setdefault('expected_result', expected_result)
+        if expected_result is not None and str(test_result) != str(expected_result):
+            result.update(status='failed', test_result=test_result, expected_result=expected_result)
+            break
+    else:
+        if result['expected_result'] is None and result['test_result'] is None:
+            result['status'] = 'no_result'
+        else:
+            answer = solve(parse_cache.load_parsed(parse_input, raw=input_raw, binary=binary))
+            result['status'] = 'ok' if answer is not None else 'no_result'
+            result['answer'] = None if answer is None else str(answer)
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def run_example(path, index):
+    """Runs solve on one of a solution file's EXAMPLES; returns a dict with 'status' and details.
+
+    'status' is 'pass', 'fail' or 'unchecked' (no expected result), plus
+    'result', 'expected' and 'elapsed' (seconds in parse_input and solve).
+    """
+    with open(path, 'r') as f:
+        namespace = load_solution(f.read(), path)
+    example, expected = _examples(namespace)[index]
+    binary = namespace.get('BINARY_INPUT', False)
+    start = time.perf_counter()
+    result = namespace['solve'](namespace['parse_input'](example.encode() if binary else example))
+    elapsed = time.perf_counter() - start
+    if expected is None:
+        status = 'unchecked'
+    else:
+        status = 'pass' if str(result) == str(expected) else 'fail'
+    return {'status': status, 'result': repr(result), 'expected': expected, 'elapsed': elapsed}
+
+
+def _check_example(path, index, timeout):
+    """Runs one example in its own Python process, so it can be killed when it times out."""
+    command = [sys.executable, os.path.abspath(__file__), os.path.abspath(path), str(index)]
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'status': 'timeout'}
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {'status': 'error', 'error': process.stderr.strip()}
+    return json.loads(lines[-1])  # solve() may print before the result line
+
+
+def check_examples(path, count, timeout=10, workers=None):
+    """Checks a solution file's first `count` EXAMPLES in parallel processes and prints a report.
+
+    Every example gets `timeout` seconds. Returns True when none failed,
+    errored or timed out and at least one passed (or, without expected
+    results, gave a result), i.e. when the real input is worth running.
+    """
+    workers = workers or min(count, os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(lambda index: _check_example(path, index, timeout), range(count)))
+
+    for number, result in enumerate(results, 1):
+        status = result['status']
+        if status == 'pass':
+            print(f"[PASS] Example {number}: {result['result']} ({result['elapsed'] * 1000:.1f} ms)")
+        elif status == 'fail':
+            print(f"[FAIL] Example {number}: expected {result['expected']}, "
+                  f"got {result['result']} ({result['elapsed'] * 1000:.1f} ms)")
+        elif status == 'unchecked':
+            print(f"Example {number}: {result['result']} ({result['elapsed'] * 1000:.1f} ms, no expected result)")
+        elif status == 'timeout':
+            print(f"[TIMEOUT] Example {number} took longer than {timeout} s")
+        else:
+            print(f"[ERROR] Example {number}:\n{result['error']}")
+
+    if any(result['status'] not in ('pass', 'unchecked') for result in results):
+        return False
+    return any(result['status'] == 'pass' or result['result'] != 'None' for result in results)
+
+
+def _worker(conn, input_path):
+    """Worker process loop: runs every solution path it receives on the cached input."""
+    for name in PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    input_key, input_raw = None, b''
+    while True:
+        path = conn.recv()
+        if path is None:
+            break
+        try:
+            stat = os.stat(input_path)
+            if (stat.st_mtime_ns, stat.st_size) != input_key:
+                with open(input_path, 'rb') as f:
+                    input_raw = f.read()
+                input_key = (stat.st_mtime_ns, stat.st_size)
+            result = run_solution(path, input_raw)
+        except Exception:
+            result = {'status': 'error', 'error': traceback.format_exc()}
+        # Results must be picklable; test results can be anything
+        result['test_result'] = repr(result.get('test_result'))
+        conn.send(result)
+
+
+class WarmRunner:
+    """Runs solution files in a long-lived worker process.
+
+    The worker preloads common libraries and keeps the puzzle input in memory,
+    so a run only costs executing the solution itself.
+    """
+    def __init__(self, input_path='input.txt'):
+        self.input_path = input_path
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context('spawn')
+        self._start()
+
+    def _start(self):
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=_worker, args=(child_conn, self.input_path))
+        self._process.daemon = True
+        self._process.start()
+
+    def run(self, path, timeout=None):
+        """Runs a solution file and returns the result dict from run_solution().
+
+        If the run takes longer than `timeout` seconds the worker is replaced
+        by a fresh one and a 'timeout' status is returned.
+        """
+        with self._lock:
+            if not self._process.is_alive():
+                self._start()
+            self._conn.send(os.path.abspath(path))
+            if self._conn.poll(timeout):
+                try:
+                    return self._conn.recv()
+                except (EOFError, OSError):
+                    pass  # Worker died, e.g. the solution called sys.exit()
+                status = 'error'
+            else:
+                status = 'timeout'
+            self._process.kill()
+            self._start()
+            return {'status': status, 'answer': None}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._process.join(1)
+            if self._process.is_alive():
+                self._process.kill()
+
+
+if __name__ == '__main__':
+    # Example worker for check_examples(): solution_runner.py <solution path> <example index>
+    print(json.dumps(run_example(sys.argv[1], int(sys.argv[2]))))
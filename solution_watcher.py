@@ -0,0 +1,194 @@
+"""Module for watching solution files and reporting when they are completely written."""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify event flags (see <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Polling fallback settings
+POLL_INTERVAL = 1  # Seconds between directory scans
+SETTLE_TIME = 0.2  # A file must be unmodified this long before it counts as written
+
+
+def _is_complete(path):
+    """Returns True if the file exists and holds a non-empty answer."""
+    try:
+        with open(path, 'r') as f:
+            return bool(f.read().strip())
+    except OSError:
+        return False
+
+
+class PollingWatcher:
+    """Watches files by scanning them at a fixed interval.
+
+    A file is reported once its size and modification time have settled, so
+    a file that is still being written is never reported.
+    """
+    def __init__(self, filenames, directory='.', interval=POLL_INTERVAL):
+        self.directory = directory
+        self.filenames = list(filenames)
+        self.interval = interval
+        self._reported = {}
+        self._wake = threading.Event()
+
+    def _scan(self):
+        ready = set()
+        now = time.time()
+        for name in self.filenames:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._reported.pop(name, None)
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._reported.get(name) == signature:
+                continue
+            if now - stat.st_mtime < SETTLE_TIME:
+                continue  # Still being written, check again on the next scan
+            if _is_complete(path):
+                self._reported[name] = signature
+                ready.add(name)
+        return ready
+
+    def wait(self, timeout=None):
+        """Blocks until at least one file is ready, the timeout expires or wake() is called.
+
+        Returns the set of file names that have been completely written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            ready = self._scan()
+            if ready:
+                return ready
+            interval = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return ready
+                interval = min(interval, remaining)
+            if self._wake.wait(interval):
+                self._wake.clear()
+                return ready
+
+    def wake(self):
+        """Interrupts a blocking wait() from another thread."""
+        self._wake.set()
+
+    def close(self):
+        self.wake()
+
+
+class InotifyWatcher:
+    """Watches files through Linux inotify.
+
+    Files are only reported after the writer closes them (or after they are
+    renamed into place), so half-written answers are never reported.
+    """
+    def __init__(self, filenames, directory='.'):
+        self.directory = directory
+        self.filenames = set(filenames)
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        # Files written before the watcher started are reported on the first wait
+        self._pending = {name for name in self.filenames
+                         if _is_complete(os.path.join(directory, name))}
+
+    def _read_events(self):
+        names = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                names.update(self.filenames)  # Events were dropped, recheck everything
+            elif name in self.filenames:
+                names.add(name)
+        return names
+
+    def wait(self, timeout=None):
+        """Blocks until at least one file is ready, the timeout expires or wake() is called.
+
+        Returns the set of file names that have been completely written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            candidates, self._pending = self._pending, set()
+            ready = {name for name in candidates
+                     if _is_complete(os.path.join(self.directory, name))}
+            if ready:
+                return ready
+
+            remaining = None
+            if deadline is not None:
+                remaining = max(0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], remaining)
+            if not readable:
+                return set()
+            self._pending |= self._read_events()
+            if self._wake_r in readable:
+                os.read(self._wake_r, 4096)
+                candidates, self._pending = self._pending, set()
+                return {name for name in candidates
+                        if _is_complete(os.path.join(self.directory, name))}
+
+    def wake(self):
+        """Interrupts a blocking wait() from another thread; does nothing once closed."""
+        with self._close_lock:
+            if not self._closed:
+                os.write(self._wake_w, b'x')
+
+    def close(self):
+        """Closes the inotify and wake-up descriptors; safe to call more than once."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for fd in (self._fd, self._wake_r, self._wake_w):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+def create_watcher(filenames, directory='.'):
+    """Returns an inotify watcher when supported, otherwise a polling watcher."""
+    try:
+        return InotifyWatcher(filenames, directory)
+    except (OSError, AttributeError, TypeError) as e:
+        print(f"inotify unavailable ({e}), falling back to polling")
+        return PollingWatcher(filenames, directory)
@@ -0,0 +1,92 @@
+"""Module for queueing answer submissions until the server allows them."""
+import heapq
+import threading
+import time
+
+
+class SubmissionScheduler:
+    """Timer queue of pending answers keyed on (day, part).
+
+    Each key holds at most one answer; scheduling a newer answer for the same
+    key replaces the queued one. Answers are released by next_due() at the
+    earliest instant the server allows for their key.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []  # (fire_at, seq, key)
+        self._pending = {}  # key -> (fire_at, seq, answer)
+        self._not_before = {}  # key -> earliest allowed submission time
+        self._seq = 0
+        self._closed = False
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _push(self, key, answer, fire_at):
+        self._seq += 1
+        self._pending[key] = (fire_at, self._seq, answer)
+        heapq.heappush(self._heap, (fire_at, self._seq, key))
+        self._cond.notify_all()
+
+    def schedule(self, day, part, answer):
+        """Queues an answer, replacing any answer already queued for (day, part)."""
+        key = (day, part)
+        with self._cond:
+            fire_at = max(time.monotonic(), self._not_before.get(key, 0))
+            self._push(key, answer, fire_at)
+
+    def defer(self, day, part, answer, delay):
+        """Requeues an answer that the server asked us to wait `delay` seconds for.
+
+        A newer answer queued in the meantime takes precedence over `answer`.
+        """
+        key = (day, part)
+        with self._cond:
+            fire_at = time.monotonic() + delay
+            self._not_before[key] = fire_at
+            current = self._pending.get(key)
+            self._push(key, current[2] if current else answer, fire_at)
+
+    def pending(self):
+        """Returns {(day, part): (seconds until due, answer)} for all queued answers."""
+        now = time.monotonic()
+        with self._cond:
+            return {key: (max(0, fire_at - now), answer)
+                    for key, (fire_at, _, answer) in self._pending.items()}
+
+    def next_due(self, timeout=None):
+        """Blocks until an answer is due and returns (day, part, answer).
+
+        Returns None if the timeout expires or the scheduler is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                while self._heap:
+                    fire_at, seq, key = self._heap[0]
+                    entry = self._pending.get(key)
+                    if entry is None or entry[1] != seq:
+                        heapq.heappop(self._heap)  # Replaced by a newer answer
+                        continue
+                    if fire_at <= now:
+                        heapq.heappop(self._heap)
+                        del self._pending[key]
+                        return key[0], key[1], entry[2]
+                    break
+
+                wait = self._heap[0][0] - now if self._heap else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+            return None
+
+    def close(self):
+        """Wakes up all waiters; next_due() returns None from now on."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
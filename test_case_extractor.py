@@ -1,31 +1,76 @@
+import importlib.util
+import os
 import re
-from bs4 import BeautifulSoup
+from bs4 import CData, NavigableString
+import html_parser
+import input_loaders
 
-def find_best_test_case(code_blocks, text):
-    """Find the most relevant test case from multiple code blocks."""
+# Scoring patterns for <pre> blocks, matched against the surrounding text
+EXAMPLE_INTRO_RE = re.compile(r'example|instance|consider|for example', re.IGNORECASE)
+FINAL_EXAMPLE_RE = re.compile(r'final example|larger example|complete example', re.IGNORECASE)
+EXPLANATION_RE = re.compile(r'produces|result|total|sum|count|distance', re.IGNORECASE)
+RULES_RE = re.compile(r'rules?:|sequences?:', re.IGNORECASE)
+
+# Patterns for inline examples
+INLINE_EXAMPLE_RE = re.compile(r'["`\']((?:[^`"\']|\n){10,})["`\']')
+INLINE_INTRO_RE = re.compile(r'example|instance|consider', re.IGNORECASE)
+INLINE_EXPLANATION_RE = re.compile(r'produces|result|total|sum', re.IGNORECASE)
+
+class DocumentIndex:
+    """Ordered index of a document's text nodes and <pre> blocks, built in a single pass.
+    
+    For every <pre> block the index stores the position of the first text node
+    at or after the block's start, so the text just before and just after the
+    block start is available in O(1).
+    """
+    def __init__(self, root):
+        text_types = root.interesting_string_types or (NavigableString, CData)
+        if isinstance(text_types, type):
+            text_types = (text_types,)
+        
+        self.text_types = text_types
+        self.strings = []
+        self.blocks = []
+        text_parts = []
+        for node in root.descendants:
+            if isinstance(node, NavigableString):
+                self.strings.append(node)
+                if type(node) in text_types:
+                    text_parts.append(node)
+            elif node.name == 'pre':
+                self.blocks.append((node, len(self.strings)))
+        self.text = ''.join(text_parts)
+    
+    def context(self, position):
+        """Returns (previous text, next text) around a block's index position."""
+        prev_text = self.strings[position - 1] if position > 0 else ''
+        next_text = self.strings[position] if position < len(self.strings) else ''
+        return prev_text or '', next_text or ''
+
+def find_best_test_case(index):
+    """Find the most relevant test case from the <pre> blocks in a DocumentIndex."""
     best_block = None
     best_score = -1
     
-    for block in code_blocks:
+    for block, position in index.blocks:
         block_text = block.text.strip()
-        prev_text = block.find_previous(text=True) or ''
-        next_text = block.find_next(text=True) or ''
+        prev_text, next_text = index.context(position)
         
         # Score this block
         score = 0
         
         # Prefer examples that are explicitly called out
-        if re.search(r'example|instance|consider|for example', prev_text, re.IGNORECASE):
+        if EXAMPLE_INTRO_RE.search(prev_text):
             score += 3
-        if re.search(r'final example|larger example|complete example', prev_text, re.IGNORECASE):
+        if FINAL_EXAMPLE_RE.search(prev_text):
             score += 5  # Prefer final/complete examples
             
         # Prefer examples that are followed by explanations
-        if re.search(r'produces|result|total|sum|count|distance', next_text, re.IGNORECASE):
+        if EXPLANATION_RE.search(next_text):
             score += 2
             
         # Prefer examples with rules or sequences
-        if re.search(r'rules?:|sequences?:', prev_text, re.IGNORECASE):
+        if RULES_RE.search(prev_text):
             score += 4
             
         # Prefer longer examples as they're usually more complete
@@ -39,7 +84,7 @@ def find_best_test_case(code_blocks, text):
 
 def find_inline_example(text):
     """Find the best inline example in text."""
-    inline_matches = re.finditer(r'["`\']((?:[^`"\']|\n){10,})["`\']', text)
+    inline_matches = INLINE_EXAMPLE_RE.finditer(text)
     best_example = None
     best_score = -1
     
@@ -51,11 +96,11 @@ def find_inline_example(text):
         score = 0
         
         # Prefer examples that are explicitly called out
-        if re.search(r'example|instance|consider', context, re.IGNORECASE):
+        if INLINE_INTRO_RE.search(context):
             score += 3
             
         # Prefer examples that are followed by explanations
-        if re.search(r'produces|result|total|sum', context, re.IGNORECASE):
+        if INLINE_EXPLANATION_RE.search(context):
             score += 2
             
         # Prefer longer examples
@@ -67,71 +112,150 @@ def find_inline_example(text):
             
     return best_example
 
+# Expected result patterns as (pattern, group), in priority order
+RESULT_PATTERNS = [
+    # Distance/Count patterns
+    (r'total distance of (\d+)', 1),
+    (r'(\d+) times', 1),
+    (r'would have (\d+)', 1),
+    (r'total of (\d+)', 1),
+    (r'(\d+) (?:stones|positions|reports|locations|antinodes)', 1),
+    (r'appears (\d+) times', 1),
+    (r'occurs [^.!?]* (\d+) times', 1),
+    
+    # Score patterns
+    (r'similarity score [^.!?]* is (\d+)', 1),
+    (r'score [^.!?]* is (\d+)', 1),
+    
+    # Sum patterns
+    (r'sum (?:is|of) (\d+)', 1),
+    (r'sum of [^.!?]* is (\d+)', 1),
+    (r'adds up to (\d+)', 1),
+    (r'total (?:is|of) (\d+)', 1),
+    (r'this is [^.!?]*?(\d+)', 1),
+    (r'the sum of [^.!?]* is (\d+)', 1),
+    
+    # Calculation patterns
+    (r'produces (?:a total of )?(\d+)', 1),
+    (r'results? in (\d+)', 1),
+    (r'equals? (\d+)', 1),
+    (r'\(.*?=\s*(\d+)\)', 1),
+    
+    # Would/Will patterns
+    (r'would be (\d+)', 1),
+    (r'will have (\d+)', 1),
+    
+    # Location/Position patterns
+    (r'(\d+) total unique locations', 1),
+    (r'(\d+) antinodes', 1),
+    (r'(\d+) different positions', 1),
+    
+    # Checksum patterns
+    (r'checksum (?:is|would be) [^.!?]*?(\d+)', 1),
+    (r'checksum [^.!?]* (\d+)', 1),
+    
+    # Generic patterns
+    (r'answer (?:is|would be) (\d+)', 1),
+    (r'result (?:is|would be) (\d+)', 1),
+    (r'score (?:is|of) (\d+)', 1)
+]
+
+RESULT_FLAGS = re.IGNORECASE | re.DOTALL
+
+def _compile_result_scanner(patterns):
+    """Compiles all result patterns into one lookahead alternation.
+    
+    At every position the alternation reports the highest-priority pattern
+    that matches there. Returns the compiled scanner and a map from each
+    pattern's wrapping group to (priority, index of its result group).
+    """
+    alternatives = []
+    groups = {}
+    group_count = 0
+    for priority, (pattern, group) in enumerate(patterns):
+        wrapper = group_count + 1
+        alternatives.append(f'({pattern})')
+        groups[wrapper] = (priority, wrapper + group)
+        group_count = wrapper + re.compile(pattern).groups
+    return re.compile('(?=' + '|'.join(alternatives) + ')', RESULT_FLAGS), groups
+
+COMPILED_RESULT_PATTERNS = [(re.compile(pattern, RESULT_FLAGS), group)
+                            for pattern, group in RESULT_PATTERNS]
+RESULT_SCANNER, RESULT_SCANNER_GROUPS = _compile_result_scanner(RESULT_PATTERNS)
+
+def find_result_candidates(text):
+    """Find every expected result candidate in a single scan over the text.
+    
+    Returns a list of (result, position, priority) in text order, where
+    priority is the index into RESULT_PATTERNS (lower is better). At each
+    position only the highest-priority matching pattern is reported.
+    """
+    candidates = []
+    for match in RESULT_SCANNER.finditer(text):
+        # The wrapping group of the matching alternative is the last one to close
+        priority, group = RESULT_SCANNER_GROUPS[match.lastindex]
+        position = match.start(group)
+        if position > 0 and text[position - 1].isdigit():
+            continue  # Tail of a number that was already reported from its first digit
+        candidates.append((match.group(group), position, priority))
+    return candidates
+
 def find_expected_result(text):
-    """Extract expected result using various patterns."""
-    result_patterns = [
-        # Distance/Count patterns
-        (r'total distance of (\d+)', 1),
-        (r'(\d+) times', 1),
-        (r'would have (\d+)', 1),
-        (r'total of (\d+)', 1),
-        (r'(\d+) (?:stones|positions|reports|locations|antinodes)', 1),
-        (r'appears (\d+) times', 1),
-        (r'occurs [^.!?]* (\d+) times', 1),
-        
-        # Score patterns
-        (r'similarity score [^.!?]* is (\d+)', 1),
-        (r'score [^.!?]* is (\d+)', 1),
-        
-        # Sum patterns
-        (r'sum (?:is|of) (\d+)', 1),
-        (r'sum of [^.!?]* is (\d+)', 1),
-        (r'adds up to (\d+)', 1),
-        (r'total (?:is|of) (\d+)', 1),
-        (r'this is [^.!?]*?(\d+)', 1),
-        (r'the sum of [^.!?]* is (\d+)', 1),
-        
-        # Calculation patterns
-        (r'produces (?:a total of )?(\d+)', 1),
-        (r'results? in (\d+)', 1),
-        (r'equals? (\d+)', 1),
-        (r'\(.*?=\s*(\d+)\)', 1),
-        
-        # Would/Will patterns
-        (r'would be (\d+)', 1),
-        (r'will have (\d+)', 1),
-        
-        # Location/Position patterns
-        (r'(\d+) total unique locations', 1),
-        (r'(\d+) antinodes', 1),
-        (r'(\d+) different positions', 1),
-        
-        # Checksum patterns
-        (r'checksum (?:is|would be) [^.!?]*?(\d+)', 1),
-        (r'checksum [^.!?]* (\d+)', 1),
-        
-        # Generic patterns
-        (r'answer (?:is|would be) (\d+)', 1),
-        (r'result (?:is|would be) (\d+)', 1),
-        (r'score (?:is|of) (\d+)', 1)
-    ]
-    
-    for pattern, group in result_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    """Extract expected result using various patterns.
+    
+    Patterns are tried in priority order and the first one that matches wins.
+    This gives the same answer as picking the best candidate from
+    find_result_candidates(), but stops as soon as a pattern matches.
+    """
+    for pattern, group in COMPILED_RESULT_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(group)
     
     return None
 
+def find_example_pairs(index):
+    """Pairs every <pre> block with the expected result in the text between it and the next block.
+    
+    Returns (example, expected result) for every block whose following text
+    states a result, in document order.
+    """
+    pairs = []
+    for i, (block, position) in enumerate(index.blocks):
+        start = position + sum(1 for node in block.descendants if isinstance(node, NavigableString))
+        end = index.blocks[i + 1][1] if i + 1 < len(index.blocks) else len(index.strings)
+        after = ''.join(node for node in index.strings[start:end] if type(node) in index.text_types)
+        example = block.text.strip()
+        result = find_expected_result(after)
+        if example and result is not None:
+            pairs.append((example, result))
+    return pairs
+
+def extract_examples(problem_text):
+    """Extract every (example, expected result) pair from problem text (HTML or an already parsed tree).
+    
+    The first pair holds the example extract_test_case() picks, with the
+    result stated right after it when there is one (its result from the
+    whole text otherwise); the others are the remaining <pre> examples
+    paired with the result stated right after them.
+    """
+    index = DocumentIndex(html_parser.as_tree(problem_text))
+    test_case, expected_result = _extract_test_case(index)
+    positional = find_example_pairs(index)
+    best = (test_case or '').strip()
+    expected_result = dict(positional).get(best, expected_result)
+    return [(test_case, expected_result)] + [pair for pair in positional if pair[0] != best]
+
 def extract_test_case(problem_text):
-    """Extract test case and expected result from problem text."""
-    soup = BeautifulSoup(problem_text, 'html.parser')
-    text = soup.get_text()
+    """Extract test case and expected result from problem text (HTML or an already parsed tree)."""
+    return _extract_test_case(DocumentIndex(html_parser.as_tree(problem_text)))
+
+def _extract_test_case(index):
+    text = index.text
     
     # First try to find test case in <pre> blocks
-    code_blocks = soup.find_all('pre')
-    if code_blocks:
-        test_case = find_best_test_case(code_blocks, text)
+    if index.blocks:
+        test_case = find_best_test_case(index)
     else:
         # If no <pre> blocks, look for inline examples
         test_case = find_inline_example(text)
@@ -141,19 +265,56 @@ def extract_test_case(problem_text):
     
     return test_case, expected_result
 
-def create_solution_template(day, part, test_case, expected_result):
-    """Create solution template with test case and expected result."""
+# Directory of the helper modules (aoc_lib, input_loaders, parse_cache) that templates import
+HELPER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Input loaders for generated templates: name -> (import line, parse_input body, parse_input takes bytes)
+TEMPLATE_LOADERS = {
+    'lines': ("", "return [line.strip() for line in input_text.split('\\n') if line.strip()]", False),
+    'ints': ("from input_loaders import parse_ints", "return parse_ints(input_bytes)  # array('q') of every integer", True),
+    'grid': ("from input_loaders import parse_grid", "return parse_grid(input_bytes)  # grid[row, col] -> byte value", True),
+    'array': ("from aoc_lib import ArrayGrid", "return ArrayGrid.from_bytes(input_bytes)  # NumPy-backed, grid[row, col] -> uint8", True),
+    'iter': ("from input_loaders import iter_lines", "return iter_lines(input_bytes)  # Lazy iterator of stripped bytes lines", True),
+}
+
+def create_solution_template(day, part, test_case, expected_result, loader=None, year=2024, examples=()):
+    """Create solution template with test case and expected result.
+    
+    `loader` selects how parse_input loads the input (see TEMPLATE_LOADERS);
+    by default it is picked from the shape of the test case, with grids
+    loaded into a NumPy-backed ArrayGrid when NumPy is installed. `examples`
+    are further (example, expected result) pairs; the template checks solve
+    against all of them in parallel before running the actual input.
+    """
+    if loader is None:
+        loader = input_loaders.detect_loader(test_case)
+        if loader == 'grid' and importlib.util.find_spec('numpy') is not None:
+            loader = 'array'
+    loader_import, parse_body, binary_input = TEMPLATE_LOADERS[loader]
+    if loader_import:
+        loader_import += "\n"
+    parse_arg = 'input_bytes' if binary_input else 'input_text'
+    
     if not test_case:
         test_case = "# No test case found in problem description"
+    more_examples = ''.join(f'    (\"\"\"\n{example}\n\"\"\", {result or "None"}),\n'
+                            for example, result in examples)
     
-    template = f"""# Advent of Code 2023 - Day {day} Part {part}
+    template = f"""# Advent of Code {year} - Day {day} Part {part}
+import sys
+sys.path.append({HELPER_DIR!r})  # aoc_helper modules, so this runs from any puzzle directory
+from aoc_lib import Point, Graph, grid_graph, bfs, dijkstra, memoized  # Grid/graph helpers
+from parse_cache import load_parsed  # Reuses parsed input while input and parse_input are unchanged
+from solution_runner import check_examples
+{loader_import}
+BINARY_INPUT = {binary_input}  # parse_input takes bytes
 
 def solve(data):
     # TODO: Implement solution
     pass
 
-def parse_input(input_text):
-    return [line.strip() for line in input_text.split('\\n') if line.strip()]
+def parse_input({parse_arg}):
+    {parse_body}
 
 # Test case
 test_input = \"\"\"
@@ -161,37 +322,22 @@ test_input = \"\"\"
 \"\"\"
 expected_result = {expected_result or 'None'}  # From problem description
 
+# Every (example, expected result) pair from the problem description; all must pass
+EXAMPLES = [
+    (test_input, expected_result),
+{more_examples}]
+EXAMPLE_TIMEOUT = 10  # Seconds each example may take
+
 # Run test case
-test_data = parse_input(test_input)
-test_result = solve(test_data)
-print(f"Test case result: {{test_result}}")
-
-# Verify against expected result
-if expected_result is not None:
-    if str(test_result) == str(expected_result):
-        print("[PASS] Test case passed!")
-        # Run actual input
-        with open('input.txt', 'r') as f:
-            input_data = parse_input(f.read())
-        result = solve(input_data)
-        print(f"Result: {{result}}")
-        
-        # Write result to solution file
-        with open(f'solution{str(part)}.txt', 'w') as f:
-            f.write(str(result))
-    else:
-        print(f"[FAIL] Test case failed! Expected {{expected_result}}, got {{test_result}}")
-else:
-    print("No expected result found in problem text")
-    if test_result is not None:
-        # Run actual input
-        with open('input.txt', 'r') as f:
-            input_data = parse_input(f.read())
-        result = solve(input_data)
-        print(f"Result: {{result}}")
-        
-        # Write result to solution file
-        with open(f'solution{str(part)}.txt', 'w') as f:
-            f.write(str(result))
+if check_examples(__file__, len(EXAMPLES), timeout=EXAMPLE_TIMEOUT):  # In parallel processes
+    print("[PASS] Test cases passed!")
+    # Run actual input
+    input_data = load_parsed(parse_input, 'input.txt', binary=BINARY_INPUT)
+    result = solve(input_data)
+    print(f"Result: {{result}}")
+    
+    # Write result to solution file
+    with open(f'solution{str(part)}.txt', 'w') as f:
+        f.write(str(result))
 """
     return template
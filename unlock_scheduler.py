@@ -0,0 +1,117 @@
+"""Module for estimating the server clock and waking up precisely at puzzle unlock.
+
+pytz and email.utils are imported on first use, so importing this module is cheap.
+"""
+import threading
+import time
+from datetime import datetime
+
+_eastern = None
+
+
+def eastern():
+    """Returns the US/Eastern timezone puzzles unlock in."""
+    global _eastern
+    if _eastern is None:
+        import pytz
+        _eastern = pytz.timezone('US/Eastern')
+    return _eastern
+
+# Wake-up settings
+COARSE_MARGIN = 1.0  # Seconds before unlock at which the coarse sleep ends
+SPIN_MARGIN = 0.005  # Seconds before unlock at which we stop sleeping and busy-wait
+FIRE_DELAY = 0.02  # Fire slightly after the latest possible unlock instant
+
+
+class ServerClock:
+    """Estimates the offset between the local clock and the server clock.
+
+    Every observed response narrows down the offset: the server stamped its
+    `Date` header (second resolution) somewhere between sending the request
+    and receiving the response, so each response bounds the offset to an
+    interval. The intersection of all intervals is kept.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.low = None
+        self.high = None
+        self.samples = 0
+
+    def observe(self, date_header, sent_at, received_at):
+        """Adds one sample from a `Date` header and the local send/receive times."""
+        from email.utils import parsedate_to_datetime
+        try:
+            server_time = parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            return
+        low = server_time - received_at
+        high = server_time + 1 - sent_at
+        with self._lock:
+            self.samples += 1
+            if self.low is None or low > self.high or high < self.low:
+                # First sample, or the clocks drifted apart: start over
+                self.low, self.high = low, high
+            else:
+                self.low, self.high = max(self.low, low), min(self.high, high)
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook that feeds every response into observe()."""
+        received_at = time.time()
+        sent_at = received_at - response.elapsed.total_seconds()
+        self.observe(response.headers.get('Date'), sent_at, received_at)
+        return response
+
+    @property
+    def offset(self):
+        """Best estimate of server time minus local time, in seconds."""
+        if self.low is None:
+            return 0.0
+        return (self.low + self.high) / 2
+
+    def now(self):
+        """Returns the estimated current server time as a Unix timestamp."""
+        return time.time() + self.offset
+
+    def local_time_for(self, server_timestamp):
+        """Returns the earliest local time at which the server has surely reached `server_timestamp`."""
+        low = 0.0 if self.low is None else self.low
+        return server_timestamp - low
+
+
+def unlock_time(year, day):
+    """Returns when the puzzle for `year`/`day` unlocks as an aware datetime."""
+    return eastern().localize(datetime(year, 12, day))
+
+
+def seconds_since_unlock(server_timestamp):
+    """Returns the seconds since the most recent midnight US/Eastern before `server_timestamp`."""
+    now = datetime.fromtimestamp(server_timestamp, eastern())
+    midnight = eastern().localize(datetime(now.year, now.month, now.day))
+    return server_timestamp - midnight.timestamp()
+
+
+def wait_for_unlock(unlock_at, clock, prewarm=None, prewarm_lead=2.0):
+    """Sleeps until the server clock reaches `unlock_at` and returns the local wake-up time.
+
+    Sleeps coarsely until shortly before the unlock, calls `prewarm` (e.g. to
+    open the TLS connection) `prewarm_lead` seconds before it, then wakes up
+    precisely by sleeping in short slices and busy-waiting the last few
+    milliseconds.
+    """
+    target = clock.local_time_for(unlock_at.timestamp()) + FIRE_DELAY
+
+    if prewarm is not None:
+        remaining = target - prewarm_lead - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+        prewarm()
+
+    remaining = target - COARSE_MARGIN - time.time()
+    if remaining > 0:
+        time.sleep(remaining)
+    while True:
+        remaining = target - time.time()
+        if remaining <= 0:
+            return time.time()
+        if remaining > SPIN_MARGIN:
+            time.sleep((remaining - SPIN_MARGIN) / 2)